@@ -10,6 +10,9 @@ from pathlib import Path
 src_dir = Path(__file__).parent / 'src'
 sys.path.insert(0, str(src_dir))
 
+# Sentinel for attributes missing from the license object
+_MISSING = object()
+
 def diagnose_license():
     """Get detailed information about the current license object."""
     print("🔍 License Diagnostic Tool")
@@ -57,14 +60,20 @@ def diagnose_license():
         
         # Print all attributes of the license object
         print("🔍 All attributes:")
-        attrs = dir(license_obj)
-        for attr in sorted(attrs):
+        instance_attrs = getattr(license_obj, '__dict__', {})
+        for attr, value in sorted(instance_attrs.items()):
             if not attr.startswith('_'):
-                try:
-                    value = getattr(license_obj, attr)
-                    print(f"   {attr}: {value} (type: {type(value).__name__})")
-                except Exception as e:
-                    print(f"   {attr}: <error getting value: {e}>")
+                print(f"   {attr}: {value} (type: {type(value).__name__})")
+        
+        # Remaining public names defined on the class itself (properties, methods)
+        for attr in sorted(type(license_obj).__dict__):
+            if attr.startswith('_') or attr in instance_attrs:
+                continue
+            try:
+                value = getattr(license_obj, attr)
+                print(f"   {attr}: {value} (type: {type(value).__name__})")
+            except Exception as e:
+                print(f"   {attr}: <error getting value: {e}>")
         
         print()
         print("🎯 FEATURE ANALYSIS:")
@@ -73,15 +82,14 @@ def diagnose_license():
         # Check all features F1-F8
         features_found = []
         for i in range(1, 9):
-            feature_name = f'F{i}'
-            if hasattr(license_obj, feature_name):
-                value = getattr(license_obj, feature_name)
-                status = "✅ ENABLED" if value else "❌ DISABLED"
-                print(f"   Feature {i} (F{i}): {status} (value: {value})")
-                if value:
-                    features_found.append(f"F{i}")
-            else:
+            value = getattr(license_obj, f'F{i}', _MISSING)
+            if value is _MISSING:
                 print(f"   Feature {i} (F{i}): ❓ NOT FOUND")
+                continue
+            status = "✅ ENABLED" if value else "❌ DISABLED"
+            print(f"   Feature {i} (F{i}): {status} (value: {value})")
+            if value:
+                features_found.append(f"F{i}")
         
         print()
         print("📋 SUMMARY:")
@@ -96,15 +104,17 @@ def diagnose_license():
         print("🧪 TESTING CURRENT LOGIC:")
         print("=" * 30)
         
-        has_f1 = hasattr(license_obj, 'F1') and license_obj.F1
-        has_f8 = hasattr(license_obj, 'F8') and license_obj.F8
+        f1 = getattr(license_obj, 'F1', _MISSING)
+        f8 = getattr(license_obj, 'F8', _MISSING)
+        has_f1 = f1 is not _MISSING and bool(f1)
+        has_f8 = f8 is not _MISSING and bool(f8)
         should_work = has_f1 or has_f8
         
-        print(f"   hasattr(license_obj, 'F1'): {hasattr(license_obj, 'F1')}")
-        print(f"   license_obj.F1 (if exists): {getattr(license_obj, 'F1', 'NOT FOUND')}")
+        print(f"   hasattr(license_obj, 'F1'): {f1 is not _MISSING}")
+        print(f"   license_obj.F1 (if exists): {'NOT FOUND' if f1 is _MISSING else f1}")
         print(f"   has_f1 result: {has_f1}")
-        print(f"   hasattr(license_obj, 'F8'): {hasattr(license_obj, 'F8')}")
-        print(f"   license_obj.F8 (if exists): {getattr(license_obj, 'F8', 'NOT FOUND')}")
+        print(f"   hasattr(license_obj, 'F8'): {f8 is not _MISSING}")
+        print(f"   license_obj.F8 (if exists): {'NOT FOUND' if f8 is _MISSING else f8}")
         print(f"   has_f8 result: {has_f8}")
         print(f"   Final result (has_f1 or has_f8): {should_work}")
         
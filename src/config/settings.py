@@ -6,18 +6,42 @@ import os
 import json
 from pathlib import Path
 
+try:
+    import orjson
+    
+    def _json_loads(data):
+        return orjson.loads(data)
+    
+    def _json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    # Fallback to the standard library if orjson is not available
+    def _json_loads(data):
+        return json.loads(data)
+    
+    def _json_dumps(obj):
+        return json.dumps(obj, indent=2).encode('utf-8')
+
 class Settings:
     def __init__(self):
         self.config_dir = Path.home() / '.yaml-translator'
         self.config_file = self.config_dir / 'config.json'
         self.config_dir.mkdir(exist_ok=True)
+        self._enc_key = None
+        self._fernet = None
         
         self.default_settings = {
             'api': {
                 'model': 'gpt-4.1',
-                'batch_size': 50,
+                'batch_size': 200,
+                'max_batch_tokens': 6000,
                 'timeout': 30,
-                'max_retries': 3
+                'max_retries': 3,
+                'max_concurrency': 8,
+                'rpm_limit': 500,
+                'tpm_limit': 200000,
+                'use_batch_api': False,
+                'translation_cache': True
             },
             'files': {
                 'auto_backup': True,
@@ -40,28 +64,40 @@ class Settings:
     
     def get_encryption_key(self):
         """Get or create encryption key for API key storage."""
+        if self._enc_key is not None:
+            return self._enc_key
         try:
             from cryptography.fernet import Fernet
             key_file = self.config_dir / 'key.key'
             
             if key_file.exists():
                 with open(key_file, 'rb') as f:
-                    return f.read()
+                    self._enc_key = f.read()
             else:
                 key = Fernet.generate_key()
                 with open(key_file, 'wb') as f:
                     f.write(key)
-                return key
+                self._enc_key = key
+            return self._enc_key
         except ImportError:
             # Fallback if cryptography is not available
             return None
     
+    def get_fernet(self):
+        """Get cached Fernet instance for API key encryption (None if unavailable)."""
+        if self._fernet is None:
+            key = self.get_encryption_key()
+            if key:
+                from cryptography.fernet import Fernet
+                self._fernet = Fernet(key)
+        return self._fernet
+    
     def load_settings(self):
         """Load settings from file or create defaults."""
         if self.config_file.exists():
             try:
-                with open(self.config_file, 'r') as f:
-                    loaded = json.load(f)
+                with open(self.config_file, 'rb') as f:
+                    loaded = _json_loads(f.read())
                 # Merge with defaults to ensure all keys exist
                 settings = self.default_settings.copy()
                 self._deep_update(settings, loaded)
@@ -75,8 +111,8 @@ class Settings:
     def save_settings(self):
         """Save current settings to file."""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.settings, f, indent=2)
+            with open(self.config_file, 'wb') as f:
+                f.write(_json_dumps(self.settings))
         except Exception as e:
             print(f"❌ Error saving settings: {e}")
     
@@ -106,18 +142,24 @@ class Settings:
         self.settings = self.default_settings.copy()
         self.save_settings()
 
-# Global settings instance
-_settings = Settings()
+# Global settings instance (created on first use)
+_settings = None
+
+def get_settings():
+    """Get global settings instance."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+    return _settings
 
 def get_stored_api_key():
     """Get stored API key (encrypted if possible)."""
-    api_key_file = _settings.config_dir / 'api_key.enc'
+    settings = get_settings()
+    api_key_file = settings.config_dir / 'api_key.enc'
     if api_key_file.exists():
         try:
-            from cryptography.fernet import Fernet
-            key = _settings.get_encryption_key()
-            if key:
-                fernet = Fernet(key)
+            fernet = settings.get_fernet()
+            if fernet:
                 with open(api_key_file, 'rb') as f:
                     encrypted_key = f.read()
                 return fernet.decrypt(encrypted_key).decode()
@@ -125,7 +167,7 @@ def get_stored_api_key():
             pass
     
     # Fallback: check for plain text (less secure)
-    plain_key_file = _settings.config_dir / 'api_key.txt'
+    plain_key_file = settings.config_dir / 'api_key.txt'
     if plain_key_file.exists():
         try:
             with open(plain_key_file, 'r') as f:
@@ -137,13 +179,12 @@ def get_stored_api_key():
 
 def save_api_key(api_key):
     """Save API key (encrypted if possible, otherwise plain text)."""
+    settings = get_settings()
     try:
-        from cryptography.fernet import Fernet
-        key = _settings.get_encryption_key()
-        if key:
-            fernet = Fernet(key)
+        fernet = settings.get_fernet()
+        if fernet:
             encrypted_key = fernet.encrypt(api_key.encode())
-            api_key_file = _settings.config_dir / 'api_key.enc'
+            api_key_file = settings.config_dir / 'api_key.enc'
             with open(api_key_file, 'wb') as f:
                 f.write(encrypted_key)
             print("✅ API key saved securely (encrypted).")
@@ -153,7 +194,7 @@ def save_api_key(api_key):
     
     # Fallback: save as plain text
     try:
-        plain_key_file = _settings.config_dir / 'api_key.txt'
+        plain_key_file = settings.config_dir / 'api_key.txt'
         with open(plain_key_file, 'w') as f:
             f.write(api_key)
         print("✅ API key saved (plain text - less secure).")
@@ -162,18 +203,18 @@ def save_api_key(api_key):
 
 def get_setting(category, key=None):
     """Get setting value."""
-    return _settings.get(category, key)
+    return get_settings().get(category, key)
 
 def set_setting(category, key, value):
     """Set setting value."""
-    _settings.set(category, key, value)
+    get_settings().set(category, key, value)
 
 def display_settings():
     """Display current settings."""
     print("📋 Current Settings:")
     print("-" * 40)
     
-    for category, settings in _settings.settings.items():
+    for category, settings in get_settings().settings.items():
         print(f"\n🔧 {category.upper()}:")
         for key, value in settings.items():
             print(f"   {key}: {value}")
@@ -187,12 +228,19 @@ def modify_settings(section):
     elif section == 'reset':
         confirm = input("⚠️  Reset all settings to defaults? (y/n): ").strip().lower()
         if confirm in ['y', 'yes']:
-            _settings.reset_to_defaults()
+            get_settings().reset_to_defaults()
             print("✅ Settings reset to defaults.")
     elif section == 'export':
         export_settings()
     elif section == 'import':
         import_settings()
+    
+    # Telemetry caches the settings it checks on every call
+    try:
+        from utils.telemetry import refresh_cached_settings
+        refresh_cached_settings()
+    except ImportError:
+        pass
 
 def modify_api_settings():
     """Modify API-related settings."""
@@ -209,6 +257,34 @@ def modify_api_settings():
     if new_batch and new_batch.isdigit():
         set_setting('api', 'batch_size', int(new_batch))
     
+    print(f"Current token budget per batch: {current['max_batch_tokens']}")
+    new_budget = input("Enter max tokens per batch (or press Enter to keep current): ").strip()
+    if new_budget and new_budget.isdigit() and int(new_budget) > 0:
+        set_setting('api', 'max_batch_tokens', int(new_budget))
+    
+    print(f"Current parallel batches: {current['max_concurrency']}")
+    new_concurrency = input("Enter max parallel batches (or press Enter to keep current): ").strip()
+    if new_concurrency and new_concurrency.isdigit() and int(new_concurrency) > 0:
+        set_setting('api', 'max_concurrency', int(new_concurrency))
+    
+    print(f"Current rate limits: {current['rpm_limit']} requests/min, {current['tpm_limit']} tokens/min (0 = unlimited)")
+    new_rpm = input("Enter requests per minute for your OpenAI tier (or press Enter to keep current): ").strip()
+    if new_rpm and new_rpm.isdigit():
+        set_setting('api', 'rpm_limit', int(new_rpm))
+    new_tpm = input("Enter tokens per minute for your OpenAI tier (or press Enter to keep current): ").strip()
+    if new_tpm and new_tpm.isdigit():
+        set_setting('api', 'tpm_limit', int(new_tpm))
+    
+    print(f"Use Batch API: {current['use_batch_api']}")
+    batch_api = input("Use OpenAI Batch API (50% cheaper, results within 24h)? (y/n): ").strip().lower()
+    if batch_api in ['y', 'yes', 'n', 'no']:
+        set_setting('api', 'use_batch_api', batch_api in ['y', 'yes'])
+    
+    print(f"Translation cache: {current['translation_cache']}")
+    use_cache = input("Reuse translations from earlier runs? (y/n): ").strip().lower()
+    if use_cache in ['y', 'yes', 'n', 'no']:
+        set_setting('api', 'translation_cache', use_cache in ['y', 'yes'])
+    
     print("✅ API settings updated.")
 
 def modify_file_settings():
@@ -235,8 +311,8 @@ def export_settings():
         export_path = "settings_export.json"
     
     try:
-        with open(export_path, 'w') as f:
-            json.dump(_settings.settings, f, indent=2)
+        with open(export_path, 'wb') as f:
+            f.write(_json_dumps(get_settings().settings))
         print(f"✅ Settings exported to {export_path}")
     except Exception as e:
         print(f"❌ Error exporting settings: {e}")
@@ -246,11 +322,12 @@ def import_settings():
     import_path = input("Enter import file path: ").strip()
     
     try:
-        with open(import_path, 'r') as f:
-            imported_settings = json.load(f)
+        with open(import_path, 'rb') as f:
+            imported_settings = _json_loads(f.read())
         
-        _settings._deep_update(_settings.settings, imported_settings)
-        _settings.save_settings()
+        settings = get_settings()
+        settings._deep_update(settings.settings, imported_settings)
+        settings.save_settings()
         print("✅ Settings imported successfully.")
     except Exception as e:
         print(f"❌ Error importing settings: {e}")
\ No newline at end of file
@@ -3,10 +3,27 @@ YAML Small Caps Reverser
 Converts small caps Unicode characters back to regular text
 """
 
+import sys
 import yaml
 import re
 from pathlib import Path
 
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    # Fall back to the pure-Python implementation without libyaml
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+try:
+    from config.settings import get_setting
+except ImportError:
+    # Fallback implementation if settings module is not available
+    def get_setting(category, key=None):
+        defaults = {'ui': {'show_progress': True, 'detailed_logging': True}}
+        if key is None:
+            return defaults.get(category, {})
+        return defaults.get(category, {}).get(key)
+
 # Reverse small caps mapping
 REVERSE_SMALL_CAPS_MAP = {
     'ᴀ': 'a', 'ʙ': 'b', 'ᴄ': 'c', 'ᴅ': 'd', 'ᴇ': 'e', 'ꜰ': 'f', 'ɢ': 'g', 'ʜ': 'h',
@@ -15,71 +32,30 @@ REVERSE_SMALL_CAPS_MAP = {
     'ʏ': 'y', 'ᴢ': 'z'
 }
 
-def flatten_yaml(d, prefix=""):
-    """Flatten nested YAML structure."""
-    items = {}
-    for k, v in d.items():
-        new_key = f"{prefix}.{k}" if prefix else k
-        if isinstance(v, dict):
-            items.update(flatten_yaml(v, new_key))
-        else:
-            items[new_key] = v
-    return items
-
-def unflatten_yaml(d):
-    """Unflatten YAML structure."""
-    result = {}
-    for k, v in d.items():
-        keys = k.split(".")
-        ref = result
-        for part in keys[:-1]:
-            ref = ref.setdefault(part, {})
-        ref[keys[-1]] = v
-    return result
+_REVERSE_TRANS = str.maketrans(REVERSE_SMALL_CAPS_MAP)
+
+# Any character the table would change; text without one is returned as is
+_MAPPABLE_RE = re.compile("[" + re.escape("".join(REVERSE_SMALL_CAPS_MAP)) + "]")
+
+# Preserve placeholders, newlines, color codes, and any XML-like tags
+_PLACEHOLDER_RE = re.compile(r'(%[^%]*%|\{[^}]*\}|&[a-zA-Z0-9]|\\n|<[^>]*>)')
 
 def from_small_caps(text):
     """Convert small caps text back to regular text, preserving placeholders, newlines, and color codes."""
     if not isinstance(text, str):
         return text
+    if not _MAPPABLE_RE.search(text):
+        return text
     
-    # Preserve placeholders, newlines, color codes, and any XML-like tags
-    placeholder_pattern = r'(%[^%]*%|\{[^}]*\}|&[a-zA-Z0-9]|\\n|<[^>]*>)'
-    placeholders = []
-    temp_text = text
-    
-    # Extract placeholders, newlines, and color codes
-    for match in re.finditer(placeholder_pattern, text):
-        placeholder = f"__PLACEHOLDER_{len(placeholders)}__"
-        placeholders.append(match.group())
-        temp_text = temp_text.replace(match.group(), placeholder, 1)
-    
-    # Convert from small caps (but keep placeholder markers unchanged)
-    result = ""
-    i = 0
-    while i < len(temp_text):
-        # Check if we're at a placeholder marker
-        if temp_text[i:].startswith("__PLACEHOLDER_"):
-            # Find the end of the placeholder marker
-            end_marker = temp_text.find("__", i + 14)
-            if end_marker != -1:
-                # Keep the placeholder marker as-is
-                placeholder_marker = temp_text[i:end_marker + 2]
-                result += placeholder_marker
-                i = end_marker + 2
-            else:
-                # Convert single character
-                result += REVERSE_SMALL_CAPS_MAP.get(temp_text[i], temp_text[i])
-                i += 1
-        else:
-            # Convert single character
-            result += REVERSE_SMALL_CAPS_MAP.get(temp_text[i], temp_text[i])
-            i += 1
-    
-    # Restore placeholders
-    for i, placeholder_text in enumerate(placeholders):
-        result = result.replace(f"__PLACEHOLDER_{i}__", placeholder_text)
-    
-    return result
+    # Translate the text between placeholders, copying placeholders verbatim
+    parts = []
+    last = 0
+    for match in _PLACEHOLDER_RE.finditer(text):
+        parts.append(text[last:match.start()].translate(_REVERSE_TRANS))
+        parts.append(match.group())
+        last = match.end()
+    parts.append(text[last:].translate(_REVERSE_TRANS))
+    return "".join(parts)
 
 class Reverser:
     def __init__(self):
@@ -96,42 +72,59 @@ class Reverser:
         
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                original = yaml.safe_load(f)
+                original = yaml.load(f, Loader=_Loader)
         except Exception as e:
             print(f"❌ Error loading YAML file: {e}")
             return None
 
-        # Flatten and process
-        flat = flatten_yaml(original)
-        processed = {}
-        
-        self.converted_count = 0
-        self.total_count = 0
+        verbose = get_setting('ui', 'detailed_logging')
+        log = []
+        # Bind hot-loop lookups to locals; counters are stored once at the end
+        convert = from_small_caps
+        log_append = log.append
+        total = 0
+        converted_count = 0
         
         print("🔄 Converting small caps back to regular text...")
         
-        for key, value in flat.items():
-            self.total_count += 1
-            if isinstance(value, str) and value.strip():
-                # Convert from small caps
-                converted = from_small_caps(value)
-                processed[key] = converted
-                if converted != value:
-                    self.converted_count += 1
-                    print(f"✓ {key}: '{value}' → '{converted}'")
+        # Walk the loaded tree and convert string leaves in place; the stack
+        # holds (dotted prefix, mapping, items iterator) to keep document order
+        stack = [("", original, iter(original.items()))]
+        while stack:
+            prefix, node, entries = stack[-1]
+            for k, value in entries:
+                if isinstance(value, dict):
+                    stack.append((f"{prefix}{k}.", value, iter(value.items())))
+                    break
+                total += 1
+                if type(value) is str and value and not value.isspace():
+                    # Convert from small caps
+                    converted = convert(value)
+                    # Unchanged values come back as the same object (fast path)
+                    if converted is not value and converted != value:
+                        node[k] = converted
+                        converted_count += 1
+                        if verbose:
+                            key = f"{prefix}{k}"
+                            log_append(f"✓ {key}: '{value}' → '{converted}'")
             else:
-                processed[key] = value
+                stack.pop()
+
+        self.total_count = total
+        self.converted_count = converted_count
+
+        if log:
+            sys.stdout.write("\n".join(log) + "\n")
 
-        # Unflatten and save
-        result = unflatten_yaml(processed)
-        
         # Generate output filename
         input_path = Path(file_path)
         output_file = f"reversed_{input_path.name}"
         
         try:
+            # Serialize in memory first so the file is written in one call
+            data = yaml.dump(original, Dumper=_Dumper, allow_unicode=True, default_flow_style=False, sort_keys=False)
             with open(output_file, "w", encoding="utf-8") as f:
-                yaml.dump(result, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+                f.write(data)
             
             print(f"\n✅ Small caps reversal completed!")
             print(f"📊 Converted {self.converted_count}/{self.total_count} text values")
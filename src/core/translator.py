@@ -2,13 +2,38 @@
 AI-powered YAML translation module with comprehensive telemetry
 """
 
+import os
+import re
 import sys
+import json
+import shutil
+import sqlite3
+import hashlib
 import yaml
 import time
+import asyncio
+import importlib.util
 from pathlib import Path
-from openai import OpenAI
-from more_itertools import chunked
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    # Fall back to the pure-Python implementation without libyaml
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    # Fallback to the standard library if orjson is not available
+    from json import loads as _json_loads
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 try:
     from utils.telemetry import BatchTelemetry, save_translation_history, format_time
@@ -17,7 +42,7 @@ except ImportError:
     # Fallback implementations if modules are not available
     def get_setting(category, key=None):
         defaults = {
-            'api': {'model': 'gpt-4o-mini', 'batch_size': 50, 'timeout': 30, 'max_retries': 3},
+            'api': {'model': 'gpt-4o-mini', 'batch_size': 200, 'max_batch_tokens': 6000, 'timeout': 30, 'max_retries': 3, 'max_concurrency': 8, 'rpm_limit': 500, 'tpm_limit': 200000, 'use_batch_api': False, 'translation_cache': True},
             'files': {'auto_backup': True, 'output_suffix': 'translated_', 'preserve_formatting': True},
             'ui': {'show_progress': True, 'detailed_logging': True}
         }
@@ -39,92 +64,274 @@ except ImportError:
     class BatchTelemetry:
         def __init__(self, total_batches):
             self.total_batches = total_batches
-            self.batches = [{'started': None, 'finished': None, 'api_start': None, 'api_end': None, 'file_start': None, 'file_end': None, 'status': 'pending'} for _ in range(total_batches)]
+            self.api_start = [None] * total_batches
+            self.api_end = [None] * total_batches
+            self.file_start = [None] * total_batches
+            self.file_end = [None] * total_batches
         
         def start_batch(self, batch_idx):
-            self.batches[batch_idx]['started'] = time.time()
-            self.batches[batch_idx]['status'] = 'running'
+            pass
         
         def start_api(self, batch_idx):
-            self.batches[batch_idx]['api_start'] = time.time()
+            self.api_start[batch_idx] = time.perf_counter()
         
         def end_api(self, batch_idx):
-            self.batches[batch_idx]['api_end'] = time.time()
+            self.api_end[batch_idx] = time.perf_counter()
         
         def start_file_ops(self, batch_idx):
-            self.batches[batch_idx]['file_start'] = time.time()
+            self.file_start[batch_idx] = time.perf_counter()
         
         def end_file_ops(self, batch_idx):
-            self.batches[batch_idx]['file_end'] = time.time()
+            self.file_end[batch_idx] = time.perf_counter()
         
         def finish_batch(self, batch_idx):
-            self.batches[batch_idx]['finished'] = time.time()
-            self.batches[batch_idx]['status'] = 'completed'
+            pass
         
         def get_api_time(self, batch_idx):
-            batch = self.batches[batch_idx]
-            if batch['api_start'] and batch['api_end']:
-                return batch['api_end'] - batch['api_start']
+            if self.api_start[batch_idx] and self.api_end[batch_idx]:
+                return self.api_end[batch_idx] - self.api_start[batch_idx]
             return None
         
         def get_file_time(self, batch_idx):
-            batch = self.batches[batch_idx]
-            if batch['file_start'] and batch['file_end']:
-                return batch['file_end'] - batch['file_start']
+            if self.file_start[batch_idx] and self.file_end[batch_idx]:
+                return self.file_end[batch_idx] - self.file_start[batch_idx]
             return None
         
         def print_status(self):
             pass  # Simplified for fallback
         
         def print_final_summary(self, total_start_time, total_items, translated_items):
-            total_time = time.time() - total_start_time
+            total_time = time.perf_counter() - total_start_time
             print(f"\n✅ Translation completed in {format_time(total_time)}")
             print(f"📊 Translated {translated_items}/{total_items} items")
 
-def flatten_yaml(d, prefix=""):
-    """Flatten nested YAML structure."""
+# Strings made only of color codes, placeholders, tags, numbers, URLs and
+# separator punctuation translate to themselves, so they never go to the API
+_SKIP_RE = re.compile(
+    r'(?:[&§][0-9a-fk-or]|%[^%]+%|\{[^}]+\}|<[^>]*>|\\n|https?://\S+|[\s\d.,:;/|*+#=_<>()\[\]!?-])+',
+    re.IGNORECASE
+)
+
+_NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)\. (.*)$', re.MULTILINE)
+
+@lru_cache(maxsize=None)
+def _token_counter(model):
+    """Return a function giving the token count of one text for model."""
+    # ~4 chars/token estimate without tiktoken
+    estimate = lambda text: len(text) // 4 + 1
+    if tiktoken is None:
+        return estimate
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+    except Exception:
+        # The encoding file is downloaded on first use; offline, estimate instead
+        return estimate
+    return lambda text: len(encoding.encode(text))
+
+def count_tokens(texts, model):
+    """Count prompt tokens for texts; estimates ~4 chars/token without tiktoken."""
+    return sum(map(_token_counter(model), texts))
+
+def flatten_yaml(d, prefix="", handles=None):
+    """Flatten nested YAML structure.
+
+    When handles is a dict it also receives (parent dict, key) for every leaf,
+    so values can later be replaced in place without rebuilding the tree.
+    """
     items = {}
-    for k, v in d.items():
-        new_key = f"{prefix}.{k}" if prefix else k
-        if isinstance(v, dict):
-            items.update(flatten_yaml(v, new_key))
-        else:
+    # Stack of (dotted prefix, node, iterator) keeps document order without
+    # recursion; each prefix already ends with "." so leaves only append a key
+    stack = [(f"{prefix}." if prefix else "", d, iter(d.items()))]
+    while stack:
+        parent, node, entries = stack[-1]
+        for k, v in entries:
+            new_key = f"{parent}{k}" if parent else k
+            if isinstance(v, dict):
+                stack.append((f"{new_key}.", v, iter(v.items())))
+                break
             items[new_key] = v
+            if handles is not None:
+                handles[new_key] = (node, k)
+        else:
+            stack.pop()
     return items
 
-def unflatten_yaml(d):
-    """Unflatten YAML structure."""
-    result = {}
-    for k, v in d.items():
-        keys = k.split(".")
-        ref = result
-        for part in keys[:-1]:
-            ref = ref.setdefault(part, {})
-        ref[keys[-1]] = v
-    return result
-
-def save_progress(output_dict, out_file):
-    """Save progress after each batch."""
-    rebuilt = unflatten_yaml(output_dict)
-    with open(out_file, "w", encoding="utf-8") as f:
-        yaml.dump(rebuilt, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+def source_digest(file_path):
+    """SHA-256 of the input file, so a checkpoint is only replayed on the file it was written for."""
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def append_checkpoint(fp, entries):
+    """Append one finished batch of translations to a checkpoint as a JSON line."""
+    fp.write(json.dumps(entries, ensure_ascii=False) + "\n")
+
+def load_checkpoint(ckpt_file, lang, source, digest):
+    """Replay a checkpoint written for lang and this exact source into a {key: translation} dict."""
+    translations = {}
+    try:
+        with open(ckpt_file, "r", encoding="utf-8") as f:
+            header = _json_loads(f.readline() or "{}")
+            # A checkpoint from another language, input file or revision of it does not apply
+            if (header.get("language") != lang or header.get("source") != source
+                    or header.get("sha256") != digest):
+                return {}
+            for line in f:
+                try:
+                    # [key, text] pairs, so integer keys survive the round trip
+                    translations.update(_json_loads(line))
+                except ValueError:
+                    break  # Torn last line from an interrupted run
+    except (OSError, ValueError):
+        return {}
+    return translations
+
+def save_progress(tree, out_file):
+    """Write the translated YAML file."""
+    # Serialize in memory first so the file gets one write instead of many small ones
+    data = yaml.dump(tree, Dumper=_Dumper, allow_unicode=True, default_flow_style=False, sort_keys=False)
+    # Write beside the target and swap it in so a crash never leaves a truncated file
+    tmp_file = f"{out_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_file, out_file)
+
+def get_cache_file():
+    """Get translation cache database path."""
+    try:
+        from config.settings import get_settings
+        return get_settings().config_dir / 'translation_cache.db'
+    except ImportError:
+        return Path.home() / '.yaml-translator' / 'translation_cache.db'
+
+class TranslationCache:
+    """Translations kept across runs, keyed by (source text hash, language, model)."""
+    
+    def __init__(self, db_file):
+        self.conn = sqlite3.connect(str(db_file))
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "hash BLOB, lang TEXT, model TEXT, translated TEXT, "
+            "PRIMARY KEY (hash, lang, model))"
+        )
+    
+    @staticmethod
+    def _hash(text):
+        return hashlib.sha256(text.encode("utf-8")).digest()
+    
+    def lookup(self, items, lang, model):
+        """Return {key: translation} for the (key, text) items already translated."""
+        found = {}
+        for key, text in items:
+            row = self.conn.execute(
+                "SELECT translated FROM translations WHERE hash=? AND lang=? AND model=?",
+                (self._hash(text), lang, model)
+            ).fetchone()
+            if row:
+                found[key] = row[0]
+        return found
+    
+    def store(self, pairs, lang, model):
+        """Remember (source text, translation) pairs."""
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?)",
+                [(self._hash(text), lang, model, translated) for text, translated in pairs]
+            )
+    
+    def close(self):
+        self.conn.close()
+
+class RateLimiter:
+    """Token buckets for requests and tokens per minute shared by all batch workers.
+
+    Both buckets refill continuously; acquire() waits until one request and
+    the estimated tokens fit, so workers run at the quota instead of into 429s.
+    A limit of 0 means unlimited and leaves that bucket out.
+    """
+    
+    def __init__(self, rpm, tpm):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.available_requests = rpm
+        self.available_tokens = tpm
+        self.last_update = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_requests = min(self.rpm, self.available_requests + self.rpm * elapsed / 60)
+        self.available_tokens = min(self.tpm, self.available_tokens + self.tpm * elapsed / 60)
+    
+    async def acquire(self, tokens):
+        """Wait for capacity for one request of roughly this many tokens."""
+        # A request larger than the whole bucket would otherwise wait forever
+        tokens = min(tokens, self.tpm)
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self._refill()
+                wait = 0
+                if self.rpm and self.available_requests < 1:
+                    wait = (1 - self.available_requests) * 60 / self.rpm
+                if self.tpm and self.available_tokens < tokens:
+                    wait = max(wait, (tokens - self.available_tokens) * 60 / self.tpm)
+                if not wait:
+                    if self.rpm:
+                        self.available_requests -= 1
+                    self.available_tokens -= tokens
+                    return
+                await asyncio.sleep(wait)
+    
+    def pause(self, seconds):
+        """Hold back every worker after the server asked us to slow down."""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+def _retry_after(error):
+    """Seconds the server asked us to wait in a 429 response, if it said."""
+    response = getattr(error, 'response', None)
+    try:
+        return float(response.headers.get('retry-after'))
+    except (AttributeError, TypeError, ValueError):
+        return None
 
 class Translator:
     def __init__(self):
         self.client = None
+        self.api_key = None
+        self._ckpt_fp = None
+        self._io_pool = None
+        self._cache = None
         self.settings = {
             'model': get_setting('api', 'model'),
             'batch_size': get_setting('api', 'batch_size'),
+            'max_batch_tokens': get_setting('api', 'max_batch_tokens') or 6000,
             'timeout': get_setting('api', 'timeout'),
-            'max_retries': get_setting('api', 'max_retries')
+            'max_retries': get_setting('api', 'max_retries'),
+            'max_concurrency': get_setting('api', 'max_concurrency') or 1,
+            'rpm_limit': get_setting('api', 'rpm_limit') or 0,
+            'tpm_limit': get_setting('api', 'tpm_limit') or 0,
+            'use_batch_api': bool(get_setting('api', 'use_batch_api')),
+            'translation_cache': bool(get_setting('api', 'translation_cache'))
         }
     
     def initialize_client(self, api_key):
         """Initialize OpenAI client."""
         try:
+            # Imported here so loading this module stays cheap
+            from openai import OpenAI
             self.client = OpenAI(api_key=api_key)
             # Test the API key with a simple request
             self.client.models.list()
+            self.api_key = api_key
             return True
         except Exception as e:
             print(f"❌ Failed to initialize OpenAI client: {e}")
@@ -135,11 +342,18 @@ class Translator:
         if not self.initialize_client(api_key):
             return None
         
+        if self.settings['use_batch_api']:
+            return self.translate_yaml_file_batch_api(file_path, language)
         return self.translate_yaml_file(file_path, language)
     
-    def translate_yaml_file(self, file_path, lang):
-        """Translate YAML file with enhanced progress tracking."""
-        total_start = time.time()
+    def load_translatable(self, file_path):
+        """Load a YAML file and queue its translatable strings.
+
+        Returns (original, targets, translatable_items), or None when there is
+        nothing to do. Identical strings are queued once; targets maps each
+        queued key to the (parent dict, key) slots its translation is written
+        to, so results go straight into original and fan out to duplicates.
+        """
         print(f"🔄 Loading file: {file_path}")
         
         # Create backup if enabled
@@ -148,74 +362,149 @@ class Translator:
         
         try:
             with open(file_path, "r", encoding="utf-8") as f:
-                original = yaml.safe_load(f)
+                original = yaml.load(f, Loader=_Loader)
         except Exception as e:
             print(f"❌ Error loading YAML file: {e}")
             return None
 
-        flat = flatten_yaml(original)
-        keys = list(flat.keys())
-        values = list(flat.values())
-
-        # Prepare output dictionary
-        output = {}
+        handles = {}
+        flat = flatten_yaml(original, handles=handles)
         translatable_items = []
+        targets = {}
+        first_key = {}
+        total_texts = 0
+        skipped = 0
+        is_code_only = _SKIP_RE.fullmatch
         
         # Process all elements
-        for key, val in zip(keys, values):
+        for key, val in flat.items():
             if isinstance(val, str) and val.lower() not in ("true", "false") and val.strip():
+                total_texts += 1
+                if is_code_only(val):
+                    skipped += 1
+                    continue
+                if val in first_key:
+                    # Repeated string: reuse the translation of its first occurrence
+                    targets[first_key[val]].append(handles[key])
+                    continue
+                first_key[val] = key
+                targets[key] = [handles[key]]
                 translatable_items.append((key, val))
                 if get_setting('ui', 'detailed_logging'):
                     print(f"🔍 Queued: {key} = '{val[:50]}{'...' if len(val) > 50 else ''}'")
-            else:
-                output[key] = val
 
-        total_translatable = len(translatable_items)
-        print(f"📊 Total translatable texts: {total_translatable}")
+        print(f"📊 Total translatable texts: {total_texts}")
+        if skipped:
+            print(f"⏭️  {skipped} texts are only codes/placeholders/numbers and are kept as-is")
+        if total_texts - skipped > len(translatable_items):
+            print(f"♻️  {total_texts - skipped - len(translatable_items)} duplicates reuse a translation, "
+                  f"{len(translatable_items)} unique texts to translate")
         
-        if total_translatable == 0:
+        if not translatable_items:
             print("✅ No translatable text found!")
             return None
+        
+        return original, targets, translatable_items
+    
+    def open_cache(self):
+        """Open the persistent translation cache if enabled (None otherwise)."""
+        if not self.settings['translation_cache']:
+            return None
+        try:
+            cache_file = get_cache_file()
+            cache_file.parent.mkdir(exist_ok=True)
+            return TranslationCache(cache_file)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Translation cache unavailable: {e}")
+            return None
+    
+    def apply_known(self, translatable_items, targets, known):
+        """Write already known translations into the tree; return the items still to translate."""
+        remaining = []
+        for key, val in translatable_items:
+            if key in known:
+                for parent, leaf in targets[key]:
+                    parent[leaf] = known[key]
+            else:
+                remaining.append((key, val))
+        return remaining
+    
+    def apply_cached(self, cache, translatable_items, targets, lang):
+        """Fill in translations from earlier runs; return the items still to translate."""
+        cached = cache.lookup(translatable_items, lang, self.settings['model'])
+        if not cached:
+            return translatable_items
+        print(f"🗃️  {len(cached)} texts reused from the translation cache")
+        return self.apply_known(translatable_items, targets, cached)
+    
+    def translate_yaml_file(self, file_path, lang):
+        """Translate YAML file with enhanced progress tracking."""
+        total_start = time.perf_counter()
+        loaded = self.load_translatable(file_path)
+        if loaded is None:
+            return None
+        original, targets, translatable_items = loaded
+        total_translatable = len(translatable_items)
 
         # Generate output filename
         output_suffix = get_setting('files', 'output_suffix')
         output_file = f"{output_suffix}{Path(file_path).name}"
-        translated_count = 0
         
-        # Initialize telemetry
-        chunks = list(chunked(translatable_items, self.settings['batch_size']))
-        total_batches = len(chunks)
-        telemetry = BatchTelemetry(total_batches)
+        # Pick up where an interrupted run left off
+        ckpt_file = f"{output_file}.ckpt.jsonl"
+        source = os.path.abspath(file_path)
+        digest = source_digest(file_path)
+        resumed = load_checkpoint(ckpt_file, lang, source, digest)
+        if resumed:
+            remaining = self.apply_known(translatable_items, targets, resumed)
+            print(f"♻️  Resuming from checkpoint: {total_translatable - len(remaining)} items already translated")
+            translatable_items = remaining
+        
+        # Texts translated by earlier runs never go back to the API
+        self._cache = self.open_cache()
+        if self._cache:
+            translatable_items = self.apply_cached(self._cache, translatable_items, targets, lang)
+        resumed_count = total_translatable - len(translatable_items)
+        
+        translated_count = 0
+        telemetry = BatchTelemetry(0)
+        # Each finished batch is appended to the checkpoint; the YAML is written once at the end.
+        # Appends run on a single worker thread (keeping their order) so disk latency
+        # overlaps with API calls; leaving the pool waits for the pending ones.
+        with open(ckpt_file, "a" if resumed else "w", encoding="utf-8", buffering=1) as self._ckpt_fp, \
+                ThreadPoolExecutor(max_workers=1) as self._io_pool:
+            if not resumed:
+                append_checkpoint(self._ckpt_fp, {"language": lang, "source": source, "sha256": digest})
+            
+            if translatable_items:
+                # Initialize telemetry
+                ordered, bounds = self.plan_batches(translatable_items)
+                chunks = (ordered[start:end] for start, end in zip(bounds, bounds[1:]))
+                total_batches = len(bounds) - 1
+                telemetry = BatchTelemetry(total_batches)
 
-        print(f"\n🚀 Starting translation into {total_batches} batches...")
+                print(f"\n🚀 Starting translation into {total_batches} batches "
+                      f"(up to {self.settings['max_concurrency']} in parallel)...")
 
-        # Process batches
-        for batch_num, chunk in enumerate(chunks, 1):
-            batch_idx = batch_num - 1
-            telemetry.start_batch(batch_idx)
-            
-            batch_size = len(chunk)
-            print(f"\n📡 Batch {batch_num}/{total_batches} ({batch_size} items)")
-            
-            if self.process_batch(chunk, lang, output, telemetry, batch_idx):
-                translated_count += len(chunk)
-                
-                # Save progress
-                telemetry.start_file_ops(batch_idx)
-                save_progress(output, output_file)
-                telemetry.end_file_ops(batch_idx)
-                telemetry.finish_batch(batch_idx)
-                
-                print(f"💾 Progress saved: {translated_count}/{total_translatable} items")
-                
-                # Show telemetry if enabled
-                if get_setting('ui', 'show_progress'):
-                    telemetry.print_status()
-            else:
-                print(f"❌ Batch {batch_num} failed, skipping...")
+                # Dispatch batches concurrently; API latency dominates, not CPU
+                translated_count = asyncio.run(
+                    self.process_batches(chunks, total_batches, lang, targets, telemetry, resumed_count, total_translatable)
+                )
+        self._ckpt_fp = None
+        self._io_pool = None
+        if self._cache:
+            self._cache.close()
+            self._cache = None
+        translated_count += resumed_count
+        
+        save_progress(original, output_file)
+        if translated_count == total_translatable:
+            Path(ckpt_file).unlink(missing_ok=True)
+        else:
+            print(f"💾 Checkpoint kept, run again to resume: {ckpt_file}")
         
         # Final summary
-        total_time = time.time() - total_start
+        total_time = time.perf_counter() - total_start
         telemetry.print_final_summary(total_start, total_translatable, translated_count)
         
         # Save to history
@@ -235,12 +524,279 @@ class Translator:
         print(f"\n✅ Translation completed! Output: {output_file}")
         return output_file
     
-    def process_batch(self, chunk, lang, output, telemetry, batch_idx):
-        """Process a single batch of translations."""
+    def translate_yaml_file_batch_api(self, file_path, lang):
+        """Translate YAML file through the OpenAI Batch API (half price, up to 24h turnaround)."""
+        total_start = time.perf_counter()
+        loaded = self.load_translatable(file_path)
+        if loaded is None:
+            return None
+        original, targets, translatable_items = loaded
+        total_translatable = len(translatable_items)
+
+        output_suffix = get_setting('files', 'output_suffix')
+        output_file = f"{output_suffix}{Path(file_path).name}"
+
+        # Texts translated by earlier runs never go back to the API
+        cache = self.open_cache()
+        if cache:
+            translatable_items = self.apply_cached(cache, translatable_items, targets, lang)
+        translated_count = total_translatable - len(translatable_items)
+
+        if translatable_items:
+            ordered, bounds = self.plan_batches(translatable_items)
+            chunks = [ordered[start:end] for start, end in zip(bounds, bounds[1:])]
+            result = self.run_batch_job(chunks, lang, targets)
+            if result is None:
+                if cache:
+                    cache.close()
+                return None
+            job_count, translated_pairs = result
+            translated_count += job_count
+            if cache:
+                cache.store(translated_pairs, lang, self.settings['model'])
+        if cache:
+            cache.close()
+
+        save_progress(original, output_file)
+
+        total_time = time.perf_counter() - total_start
+        print(f"\n📊 Translated {translated_count}/{total_translatable} items in {format_time(total_time)}")
+
+        # Save to history
+        try:
+            save_translation_history({
+                'timestamp': datetime.now().isoformat(),
+                'file': file_path,
+                'language': lang,
+                'items_translated': translated_count,
+                'total_items': total_translatable,
+                'duration': format_time(total_time),
+                'status': 'completed' if translated_count > 0 else 'failed'
+            })
+        except:
+            pass  # Ignore history save errors
+
+        print(f"\n✅ Translation completed! Output: {output_file}")
+        return output_file
+    
+    def run_batch_job(self, chunks, lang, targets):
+        """Submit chunks as one Batch API job, wait for it and write the results.
+
+        Returns (translated_count, [(source text, translation), ...]), or None
+        if the job could not be completed.
+        """
+        # One JSONL request per chunk; custom_id maps results back to chunks
+        requests = [
+            json.dumps({
+                "custom_id": f"b{batch_idx}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.settings['model'],
+                    "messages": self.build_messages(chunk, lang),
+                    "response_format": {"type": "json_object"}
+                }
+            }, ensure_ascii=False)
+            for batch_idx, chunk in enumerate(chunks)
+        ]
+        
+        job_start = time.perf_counter()
+        try:
+            print(f"\n📤 Uploading {len(chunks)} requests to the Batch API...")
+            batch_input = self.client.files.create(
+                file=("batch_input.jsonl", "\n".join(requests).encode("utf-8")),
+                purpose="batch"
+            )
+            batch = self.client.batches.create(
+                input_file_id=batch_input.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
+            )
+            print(f"🆔 Batch job: {batch.id}")
+        
+            # Poll with backoff; batch jobs take minutes to hours
+            delay = 5
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                time.sleep(delay)
+                delay = min(delay * 2, 300)
+                batch = self.client.batches.retrieve(batch.id)
+                counts = batch.request_counts
+                done = f" ({counts.completed}/{counts.total})" if counts else ""
+                print(f"⏳ Batch status: {batch.status}{done} - {format_time(time.perf_counter() - job_start)} elapsed")
+        
+            if batch.status != "completed" or not batch.output_file_id:
+                print(f"❌ Batch job ended with status: {batch.status}")
+                return None
+        
+            results = self.client.files.content(batch.output_file_id).text
+        except Exception as e:
+            print(f"❌ Batch API request failed: {e}")
+            return None
+        
+        # Splice results back by custom_id
+        translated_count = 0
+        translated_pairs = []
+        for line in results.splitlines():
+            if not line.strip():
+                continue
+            try:
+                record = _json_loads(line)
+                chunk = chunks[int(record["custom_id"][1:])]
+                response_text = record["response"]["body"]["choices"][0]["message"]["content"].strip()
+            except Exception as e:
+                print(f"⚠️  Skipping unreadable batch result: {e}")
+                continue
+            translations = self.apply_translations(chunk, response_text, targets)
+            translated_count += len(translations)
+            translated_pairs.extend((text, translations[key]) for key, text in chunk if key in translations)
+        
+        return translated_count, translated_pairs
+    
+    async def process_batches(self, chunks, total_batches, lang, targets, telemetry, resumed_count, total_translatable):
+        """Translate all batches concurrently, checkpointing each one as it completes.
+
+        chunks is consumed lazily by max_concurrency workers, so only the
+        batches currently in flight are materialized.
+        """
+        batches = enumerate(chunks)
+        translated_count = 0
+        
+        import httpx
+        from openai import AsyncOpenAI
+        
+        # One pooled connection per worker, kept alive across batches so each
+        # request skips the TLS handshake; HTTP/2 multiplexes them when h2 is installed
+        concurrency = self.settings['max_concurrency']
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+            timeout=self.settings['timeout'],
+            http2=importlib.util.find_spec("h2") is not None
+        )
+        
+        # Each limit is optional on its own; 0 leaves it unpaced
+        limiter = None
+        if self.settings['rpm_limit'] > 0 or self.settings['tpm_limit'] > 0:
+            limiter = RateLimiter(self.settings['rpm_limit'], self.settings['tpm_limit'])
+        
+        async with AsyncOpenAI(api_key=self.api_key, http_client=http_client) as client:
+            async def worker():
+                nonlocal translated_count
+                # Workers share one iterator; next() never yields to the loop, so no batch is taken twice
+                for batch_idx, chunk in batches:
+                    telemetry.start_batch(batch_idx)
+                    print(f"\n📡 Batch {batch_idx + 1}/{total_batches} ({len(chunk)} items)")
+                    translations = await self.process_batch(client, limiter, chunk, lang, targets, telemetry, batch_idx)
+                    if translations is None:
+                        print(f"❌ Batch {batch_idx + 1} failed, skipping...")
+                        continue
+                    
+                    # Only keys that actually got a translation count as done
+                    translated_count += len(translations)
+                    
+                    if self._cache:
+                        self._cache.store(
+                            [(text, translations[key]) for key, text in chunk if key in translations],
+                            lang, self.settings['model']
+                        )
+                    
+                    # Checkpoint progress in the background
+                    telemetry.start_file_ops(batch_idx)
+                    pending_io = self._io_pool.submit(append_checkpoint, self._ckpt_fp, list(translations.items()))
+                    pending_io.add_done_callback(
+                        lambda done, idx=batch_idx: self._checkpoint_written(done, idx, telemetry)
+                    )
+                    telemetry.finish_batch(batch_idx)
+                    
+                    print(f"💾 Progress saved: {resumed_count + translated_count}/{total_translatable} items")
+                    
+                    # Show telemetry if enabled
+                    if get_setting('ui', 'show_progress'):
+                        telemetry.print_status()
+            
+            await asyncio.gather(*(worker() for _ in range(min(self.settings['max_concurrency'], total_batches))))
+        
+        return translated_count
+    
+    def _checkpoint_written(self, pending_io, batch_idx, telemetry):
+        """Record file timing for a background checkpoint write and report failures."""
+        telemetry.end_file_ops(batch_idx)
+        if pending_io.exception() is not None:
+            print(f"⚠️  Checkpoint write failed for batch {batch_idx + 1}: {pending_io.exception()}")
+    
+    def plan_batches(self, translatable_items):
+        """Group items into batches under both the item and token limits.
+
+        Items are sorted longest first so each request carries texts of similar
+        size and the slowest batches start first instead of holding up the end
+        of the run. Filling batches up to max_batch_tokens trades
+        requests-per-minute for tokens-per-minute, the limit short-string YAML
+        files hit first. Returns (ordered items, batch boundaries).
+        """
+        count = _token_counter(self.settings['model'])
+        max_items = self.settings['batch_size']
+        budget = self.settings['max_batch_tokens']
+        ordered = sorted(translatable_items, key=lambda item: len(item[1]), reverse=True)
+        
+        bounds = [0]
+        batch_tokens = 0
+        for i, (_, text) in enumerate(ordered):
+            # ~4 extra tokens per item for the JSON key and quoting
+            cost = count(text) + 4
+            if i > bounds[-1] and (i - bounds[-1] >= max_items or batch_tokens + cost > budget):
+                bounds.append(i)
+                batch_tokens = 0
+            batch_tokens += cost
+        bounds.append(len(ordered))
+        return ordered, bounds
+    
+    def build_messages(self, chunk, lang):
+        """Build the chat messages for one batch of (key, text) items."""
+        payload = json.dumps({str(i + 1): text for i, (_, text) in enumerate(chunk)}, ensure_ascii=False)
+        return [
+            {"role": "system", "content": f"Translate the values of this JSON object to {lang}. Keep ALL placeholders like {{value}}, {{player}}, &7, &a, %placeholders%, \\n, <#RRGGBB> EXACTLY as they are. Do not change newlines (\\n), hex colors (<#RRGGBB>), or any formatting codes. Return a JSON object mapping each key (the 1-based index as a string) to its translated text, for example {{\"1\": \"...\", \"2\": \"...\"}}."},
+            {"role": "user", "content": payload}
+        ]
+    
+    def parse_response(self, response_text, count):
+        """Return the translated texts of a batch in order (None where missing)."""
+        try:
+            data = _json_loads(response_text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return [data.get(str(i + 1)) for i in range(count)]
+        
+        # Fall back to numbered "1. text" lines, matched by number so any
+        # surrounding prose cannot shift translations onto the wrong keys
+        numbered = dict(_NUMBERED_LINE_RE.findall(response_text))
+        return [numbered.get(str(i + 1)) for i in range(count)]
+    
+    def apply_translations(self, chunk, response_text, targets):
+        """Parse a batch response and write each translation into the tree.
+
+        Returns {key: translation} for the items that were translated; missing
+        ones keep their original text.
+        """
+        translated_batch = self.parse_response(response_text, len(chunk))
+        applied = {}
+        for i, (key, original) in enumerate(chunk):
+            translated = translated_batch[i] if i < len(translated_batch) else None
+            if isinstance(translated, str):
+                for parent, leaf in targets[key]:
+                    parent[leaf] = translated
+                applied[key] = translated
+            else:
+                print(f"⚠️  Missing translation for: {key}")
+        return applied
+    
+    async def process_batch(self, client, limiter, chunk, lang, targets, telemetry, batch_idx):
+        """Process a single batch of translations; returns them, or None on failure."""
         try:
-            # Prepare texts
-            texts_to_translate = [item[1] for item in chunk]
-            prompt = "\n".join([f"{i+1}. {text}" for i, text in enumerate(texts_to_translate)])
+            messages = self.build_messages(chunk, lang)
+            if limiter:
+                # Prompt plus a reply about as long as the source texts
+                estimated_tokens = (count_tokens([m["content"] for m in messages], self.settings['model'])
+                                    + count_tokens([text for _, text in chunk], self.settings['model']))
             
             print(f"🤖 Sending to AI...")
             telemetry.start_api(batch_idx)
@@ -248,57 +804,44 @@ class Translator:
             # Make API call with retry logic
             for attempt in range(self.settings['max_retries']):
                 try:
-                    resp = self.client.chat.completions.create(
+                    if limiter:
+                        await limiter.acquire(estimated_tokens)
+                    resp = await client.chat.completions.create(
                         model=self.settings['model'],
-                        messages=[
-                            {"role": "system", "content": f"Translate these texts to {lang}. Keep ALL placeholders like {{value}}, {{player}}, &7, &a, %placeholders%, \\n, <#RRGGBB> EXACTLY as they are. Do not change newlines (\\n), hex colors (<#RRGGBB>), or any formatting codes. Return only the translated text in numbered format."},
-                            {"role": "user", "content": prompt}
-                        ],
+                        messages=messages,
+                        response_format={"type": "json_object"},
                         timeout=self.settings['timeout']
                     )
                     break
                 except Exception as e:
                     if attempt < self.settings['max_retries'] - 1:
+                        delay = 2 ** attempt  # Exponential backoff
+                        if getattr(e, 'status_code', None) == 429:
+                            delay = _retry_after(e) or delay
+                            if limiter:
+                                limiter.pause(delay)
                         print(f"⚠️  API call failed (attempt {attempt + 1}), retrying...")
-                        time.sleep(2 ** attempt)  # Exponential backoff
+                        await asyncio.sleep(delay)
                     else:
                         raise e
             
             telemetry.end_api(batch_idx)
             response_text = resp.choices[0].message.content.strip()
-            
-            # Parse response
-            lines = response_text.splitlines()
-            translated_batch = []
-            for line in lines:
-                if ". " in line and line[0].isdigit():
-                    translated_batch.append(line.split(". ", 1)[1])
-                elif line.strip() and not line.startswith(("1.", "2.", "3.", "4.", "5.")):
-                    translated_batch.append(line.strip())
-            
-            # Apply translations
-            for i, (key, original) in enumerate(chunk):
-                if i < len(translated_batch):
-                    output[key] = translated_batch[i]
-                else:
-                    print(f"⚠️  Missing translation for: {key}")
-                    output[key] = original
+            translations = self.apply_translations(chunk, response_text, targets)
             
             api_time = telemetry.get_api_time(batch_idx)
             print(f"✅ Batch completed ({format_time(api_time or 0)})")
-            return True
+            return translations
             
         except Exception as e:
             print(f"❌ Batch processing failed: {e}")
-            return False
+            return None
     
     def create_backup(self, file_path):
         """Create backup of original file."""
         try:
             backup_path = f"{file_path}.backup"
-            with open(file_path, 'r', encoding='utf-8') as src:
-                with open(backup_path, 'w', encoding='utf-8') as dst:
-                    dst.write(src.read())
+            shutil.copyfile(file_path, backup_path)
             print(f"💾 Backup created: {backup_path}")
         except Exception as e:
             print(f"⚠️  Backup creation failed: {e}")
\ No newline at end of file
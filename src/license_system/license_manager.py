@@ -6,6 +6,7 @@ Handles Cryptolens license verification and management
 
 import os
 import json
+import time
 from pathlib import Path
 from typing import Optional, Tuple, Dict, Any
 
@@ -16,19 +17,40 @@ CRYPTOLENS_CONFIG = {
     'rsa_public_key': '<RSAKeyValue><Modulus>m/f3k/vrYBHUjOVMci+CvPWIQDKumXhqfvrZDlf/jFqcMvOjvSP6KvDsMAFnupcaDdROWqVAO8r712UiC4spUnpSLmnd3PGw5+x+1Mwmxw5WWEh0K6Qu23shhe+J9OLKhWrNJHbgYBugl6eP6RUEmXmCDZJxQLdsXe8ro44uyDcw61APvtEhQ1ofdZmN9Wt2Fa0akUlHN8WPCRlacHRaQDc/GqQ9Wovoz/80HKxdbYTJKy+7smF3yQ6CgSwx1AGIX7jd/UBhfbMbdtSOyIyf8M1f+C9kAqo3leJHf2Fvaq5hJtYJdUVlrmgGtV/Bb1uNY8RGWzc9Pvy9V+Y+q9aMyQ==</Modulus><Exponent>AQAB</Exponent></RSAKeyValue>'
 }
 
+# Successful server validations are trusted from disk for this long,
+# re-checked hourly once the license is close to expiring. Age is measured
+# from the server's signature date, which a local edit cannot change
+LICENSE_CACHE_TTL = 24 * 60 * 60
+LICENSE_CACHE_TTL_NEAR_EXPIRY = 60 * 60
+NEAR_EXPIRY_WINDOW = 72 * 60 * 60
+# Allowed difference between the server's clock and ours
+LICENSE_CLOCK_SKEW = 5 * 60
+# Start of Key.activate's error message when no answer came from the server
+SERVER_UNREACHABLE = "Could not contact the server"
+
 class LicenseManager:
     """Manages license verification and storage for the YAML Translator Tool."""
     
+    # (Key, Helpers) from Cryptolens, resolved once per process
+    _cryptolens = None
+    # Hardware-derived, so it cannot change within a process
+    _machine_code = None
+    
     def __init__(self):
         self.license_file = Path.home() / '.yamltranslator' / 'license.json'
         self.license_file.parent.mkdir(exist_ok=True)
         self._cached_license = None
         self._license_valid = None
+        self._license_message = None
+        self._validated_key = None
         
     def _import_cryptolens(self):
         """Import Cryptolens modules with fallback handling."""
+        if LicenseManager._cryptolens is not None:
+            return LicenseManager._cryptolens
         try:
             from licensing.methods import Key, Helpers
+            LicenseManager._cryptolens = (Key, Helpers)
             return Key, Helpers
         except ImportError as e:
             print("❌ Cryptolens library not found. Please install it:")
@@ -47,18 +69,99 @@ class LicenseManager:
             }
             
             # Save to license file
-            with open(self.license_file, 'w') as f:
-                json.dump(license_data, f, indent=2)
+            self._write_license_data(license_data)
             
             print("✅ License key saved successfully")
             self._cached_license = None  # Clear cache
             self._license_valid = None
+            self._validated_key = None
             return True
             
         except Exception as e:
             print(f"❌ Error saving license key: {e}")
             return False
     
+    def _read_license_data(self) -> Dict[str, Any]:
+        """Read the stored license file (empty dict if missing or unreadable)."""
+        try:
+            with open(self.license_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _write_license_data(self, license_data: Dict[str, Any]) -> None:
+        """Write the license file atomically so a crash never leaves it half-written."""
+        tmp_file = self.license_file.with_name(self.license_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(license_data, f, indent=2)
+        os.replace(tmp_file, self.license_file)
+    
+    def _store_validation(self, license_key: str, license_obj) -> None:
+        """Persist a successful validation so later runs can skip the server.
+        
+        Only Cryptolens' signed response is stored; it is checked against the
+        RSA public key and this machine before it is trusted again.
+        """
+        try:
+            signed_license = license_obj.save_as_string()
+        except Exception:
+            return  # Nothing verifiable to store
+        license_data = self._read_license_data()
+        # Drop fields written by older versions that stored plain flags
+        for stale in ('last_validated', 'valid', 'expires', 'license'):
+            license_data.pop(stale, None)
+        license_data.update({
+            'license_key': license_key,
+            'product_id': CRYPTOLENS_CONFIG['product_id'],
+            'signed_license': signed_license
+        })
+        try:
+            self._write_license_data(license_data)
+        except OSError as e:
+            print(f"⚠️  Could not cache license validation: {e}")
+    
+    def _forget_validation(self) -> None:
+        """Drop the stored validation so it is not trusted after a failed check."""
+        license_data = self._read_license_data()
+        if license_data.pop('signed_license', None) is None:
+            return
+        try:
+            self._write_license_data(license_data)
+        except OSError as e:
+            print(f"⚠️  Could not update license cache: {e}")
+    
+    def _load_cached_validation(self, license_key: str, ignore_ttl: bool = False):
+        """Return the license from the last successful validation, if still fresh and genuine."""
+        license_data = self._read_license_data()
+        signed_license = license_data.get('signed_license')
+        if license_data.get('license_key') != license_key or not signed_license:
+            return None
+        try:
+            from licensing.models import LicenseKey
+            Key, Helpers = self._import_cryptolens()
+            license_obj = LicenseKey.load_from_string(CRYPTOLENS_CONFIG['rsa_public_key'], signed_license)
+            # Bad signature, another key's response, or another machine's copy
+            if license_obj is None or getattr(license_obj, 'key', None) != license_key:
+                return None
+            if not Helpers.IsOnRightMachine(license_obj, custom_machine_code=self.get_machine_code()):
+                return None
+            signed_at = license_obj.sign_date.timestamp()
+            expires = license_obj.expires.timestamp() if getattr(license_obj, 'expires', None) else None
+        except Exception:
+            return None
+        
+        now = time.time()
+        if signed_at > now + LICENSE_CLOCK_SKEW:
+            return None  # Signed "in the future": clock tampering
+        if expires and now > expires:
+            return None
+        ttl = LICENSE_CACHE_TTL
+        if expires and expires - now < NEAR_EXPIRY_WINDOW:
+            ttl = LICENSE_CACHE_TTL_NEAR_EXPIRY
+        if not ignore_ttl and now - signed_at >= ttl:
+            return None
+        return license_obj
+    
     def load_license_key(self) -> Optional[str]:
         """Load license key from storage."""
         try:
@@ -74,20 +177,20 @@ class LicenseManager:
             print(f"⚠️  Error loading license key: {e}")
             return None
     
-    def verify_license(self, license_key: Optional[str] = None, offline_check: bool = False) -> Tuple[bool, str]:
+    def verify_license(self, license_key: Optional[str] = None, offline_check: bool = False,
+                       refresh: bool = False) -> Tuple[bool, str]:
         """
         Verify license key with Cryptolens server.
         
         Args:
             license_key: License key to verify (if None, loads from storage)
-            offline_check: If True, performs offline validation only
+            offline_check: If True, only uses the last validation stored on disk
+            refresh: If True, ignores cached validations and asks the server
             
         Returns:
             Tuple of (is_valid, message)
         """
         try:
-            Key, Helpers = self._import_cryptolens()
-            
             # Get license key
             if license_key is None:
                 license_key = self.load_license_key()
@@ -96,8 +199,24 @@ class LicenseManager:
                 return False, "No license key found. Please enter a valid license key."
             
             # Check cached result first (for performance)
-            if self._license_valid is not None and license_key == getattr(self._cached_license, 'Key', None):
-                return self._license_valid, "License validated (cached)"
+            if not refresh and self._license_valid is not None and license_key == self._validated_key:
+                if not self._license_valid:
+                    return False, self._license_message
+                return True, "License validated (cached)"
+            
+            # A recent successful validation on disk avoids the server round-trip
+            cached_license = None
+            if not refresh or offline_check:
+                cached_license = self._load_cached_validation(license_key, ignore_ttl=offline_check)
+            if cached_license is not None:
+                self._cached_license = cached_license
+                self._license_valid = True
+                self._validated_key = license_key
+                return True, self._check_license_features(cached_license)
+            if offline_check:
+                return False, "No stored license validation available for offline check"
+            
+            Key, Helpers = self._import_cryptolens()
             
             print("🔍 Verifying license with Cryptolens server...")
             
@@ -107,19 +226,32 @@ class LicenseManager:
                 rsa_pub_key=CRYPTOLENS_CONFIG['rsa_public_key'],
                 product_id=CRYPTOLENS_CONFIG['product_id'],
                 key=license_key,
-                machine_code=Helpers.GetMachineCode(v=2)
+                machine_code=self.get_machine_code()
             )
             
             if result[0] is None:
                 # License verification failed
                 error_msg = result[1] if len(result) > 1 else "Unknown error"
+                message = f"License verification failed: {error_msg}"
+                self._cached_license = None
+                if str(error_msg).startswith(SERVER_UNREACHABLE):
+                    # A network problem says nothing about the key; try again next time
+                    self._license_valid = None
+                    self._validated_key = None
+                    return False, message
+                # The server rejected the key: remember that and stop trusting the disk copy
                 self._license_valid = False
-                return False, f"License verification failed: {error_msg}"
+                self._license_message = message
+                self._validated_key = license_key
+                self._forget_validation()
+                return False, message
             
             # License is valid
             license_obj = result[0]
             self._cached_license = license_obj
             self._license_valid = True
+            self._validated_key = license_key
+            self._store_validation(license_key, license_obj)
             
             # Check license features and expiration
             validation_msg = self._check_license_features(license_obj)
@@ -144,6 +276,18 @@ class LicenseManager:
             print(f"Error checking features: {e}")
             return False
 
+    def verify_with_features(self, license_key: Optional[str] = None,
+                             refresh: bool = False) -> Tuple[bool, str, bool]:
+        """Verify the license and check its features from the same validation.
+        
+        Returns:
+            Tuple of (is_valid, message, has_features)
+        """
+        is_valid, message = self.verify_license(license_key, refresh=refresh)
+        if not is_valid or not self._cached_license:
+            return is_valid, message, False
+        return is_valid, message, bool(self._has_yaml_translator_features(self._cached_license))
+
     def has_required_features(self) -> Tuple[bool, str]:
         """Check if current license has required features for YAML Translator."""
         try:
@@ -220,9 +364,12 @@ class LicenseManager:
     
     def get_machine_code(self) -> str:
         """Get the machine code for this device."""
+        if LicenseManager._machine_code is not None:
+            return LicenseManager._machine_code
         try:
             Key, Helpers = self._import_cryptolens()
-            return Helpers.GetMachineCode(v=2)
+            LicenseManager._machine_code = Helpers.GetMachineCode(v=2)
+            return LicenseManager._machine_code
         except ImportError:
             return "Cryptolens library not available"
         except Exception as e:
@@ -236,6 +383,7 @@ class LicenseManager:
             
             self._cached_license = None
             self._license_valid = None
+            self._validated_key = None
             print("✅ License key cleared")
             return True
             
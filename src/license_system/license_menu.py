@@ -4,52 +4,91 @@ License Menu for YAML Translator Tool
 Provides user interface for license management with feature checking
 """
 
-import os
+import re
 import sys
 from typing import Optional
 
-def clear_screen():
-    """Clear the console screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+from utils.console import clear_screen
+
+# Cryptolens key shape (XXXXX-XXXXX-XXXXX-XXXXX); malformed input is
+# rejected before it costs a server round-trip
+_LICENSE_RE = re.compile(r"[A-Z0-9]{5}(?:-[A-Z0-9]{5}){3}")
+
+# License manager resolved once per process; an ImportError is remembered
+# so later menu redraws fail fast instead of retrying the import
+_manager = None
+_manager_error = None
+
+def _mgr():
+    """Return the shared license manager, importing it on first use."""
+    global _manager, _manager_error
+    if _manager is None:
+        if _manager_error is not None:
+            raise _manager_error
+        try:
+            from license_system.license_manager import get_license_manager
+        except ImportError as e:
+            _manager_error = e
+            raise
+        _manager = get_license_manager()
+    return _manager
+
+def _check_all(manager, license_key):
+    """Validity, message and feature check for license_key from one verification.
+    
+    Returns a dict with 'is_valid', 'message' and 'has_features'. Repeat calls
+    are answered from the manager's own validation memo.
+    """
+    is_valid, message, has_features = manager.verify_with_features(license_key)
+    return {'is_valid': is_valid, 'message': message, 'has_features': has_features}
+
+_BANNER = ("╔" + "═" * 68 + "╗\n"
+           + "║" + " " * 22 + "🔑 License Management 🔑" + " " * 21 + "║\n"
+           + "╚" + "═" * 68 + "╝\n\n")
 
 def show_license_banner():
     """Display license management banner."""
-    print("╔" + "═" * 68 + "╗")
-    print("║" + " " * 22 + "🔑 License Management 🔑" + " " * 21 + "║")
-    print("╚" + "═" * 68 + "╝")
-    print()
+    sys.stdout.write(_BANNER)
+
+# Last status block shown, so the menu can redraw it without re-checking
+_last_status = None
 
 def display_license_status():
     """Display current license status with feature checking."""
+    global _last_status
+    _last_status = None
     try:
-        from license_system.license_manager import get_license_manager
-        
-        manager = get_license_manager()
+        manager = _mgr()
+        license_key = manager.load_license_key()
         status = manager.get_license_status()
         
-        print("📊 Current License Status:")
-        print("─" * 40)
+        # Collected and written in one go since the menu redraws this often
+        lines = ["📊 Current License Status:", "─" * 40]
         
         if status['has_license']:
-            print(f"🔑 License Key: {status['license_key_preview']}")
-            print(f"✅ Valid: {'Yes' if status['is_valid'] else 'No'}")
-            print(f"📝 Status: {status['message']}")
+            lines.append(f"🔑 License Key: {status['license_key_preview']}")
+            lines.append(f"✅ Valid: {'Yes' if status['is_valid'] else 'No'}")
+            lines.append(f"📝 Status: {status['message']}")
             
             # Check specific features if license is valid
             if status['is_valid']:
-                has_yaml_feature = manager.has_required_features()
+                has_yaml_feature = _check_all(manager, license_key)['has_features']
                 if has_yaml_feature:
-                    print("🎉 Features: YAML Translator features available")
+                    lines.append("🎉 Features: YAML Translator features available")
                 else:
-                    print("⚠️  Features: License valid but missing YAML Translator features")
-                    print("   Required: Feature 1 (YAML Translator) OR Feature 8 (All Features)")
+                    lines.append("⚠️  Features: License valid but missing YAML Translator features")
+                    lines.append("   Required: Feature 1 (YAML Translator) OR Feature 8 (All Features)")
         else:
-            print("❌ No license key found")
+            lines.append("❌ No license key found")
             
-        print(f"💻 Machine Code: {status['machine_code']}")
-        print()
+        lines.append(f"💻 Machine Code: {status['machine_code']}")
+        lines.append("")
+        text = "\n".join(lines) + "\n"
+        sys.stdout.write(text)
         
-        return status['is_valid'] and (not status['has_license'] or manager.has_required_features())
+        is_licensed = status['is_valid'] and (not status['has_license'] or _check_all(manager, license_key)['has_features'])
+        _last_status = (text, is_licensed)
+        return is_licensed
         
     except ImportError:
         print("❌ License management system not available")
@@ -58,11 +97,17 @@ def display_license_status():
         print(f"❌ Error checking license status: {e}")
         return False
 
+def _reprint_cached_status():
+    """Re-emit the last status block, refreshing it if there is none."""
+    if _last_status is None:
+        return display_license_status()
+    text, is_licensed = _last_status
+    sys.stdout.write(text)
+    return is_licensed
+
 def enter_license_key() -> bool:
     """Prompt user to enter a license key."""
     try:
-        from license_system.license_manager import get_license_manager
-        
         print("🔑 Enter License Key")
         print("─" * 30)
         print("Please enter your YAML Translator license key.")
@@ -70,22 +115,22 @@ def enter_license_key() -> bool:
         print()
         
         # Get machine code first
-        manager = get_license_manager()
-        machine_code = manager.get_machine_code()
-        print(f"💻 Your Machine Code: {machine_code}")
+        manager = _mgr()
+        print(f"💻 Your Machine Code: {manager.get_machine_code()}")
         print("   (You may need this when purchasing/activating your license)")
         print()
         
-        # Prompt for license key
-        license_key = input("License Key: ").strip()
+        # Prompt for license key; Cryptolens keys are upper case
+        license_key = input("License Key: ").strip().upper()
         
         if not license_key:
             print("❌ No license key entered")
             return False
         
-        # Validate format (basic check)
-        if len(license_key) < 10:
-            print("❌ License key appears to be too short")
+        # Validate format before saving or contacting the server
+        if not _LICENSE_RE.fullmatch(license_key):
+            print("❌ License key format invalid")
+            print("   Expected format: XXXXX-XXXXX-XXXXX-XXXXX")
             return False
         
         # Save and verify license
@@ -95,13 +140,14 @@ def enter_license_key() -> bool:
             return False
         
         # Verify the license with feature checking
-        is_valid, message = manager.verify_license(license_key)
+        result = _check_all(manager, license_key)
+        is_valid, message = result['is_valid'], result['message']
         
         if is_valid:
             print(f"✅ {message}")
             
             # Check if it has the required features
-            if manager.has_required_features():
+            if result['has_features']:
                 print("\n🎉 License activated successfully!")
                 print("✅ Your license includes YAML Translator features!")
             else:
@@ -129,9 +175,7 @@ def enter_license_key() -> bool:
 def verify_existing_license() -> bool:
     """Verify the currently stored license."""
     try:
-        from license_system.license_manager import get_license_manager
-        
-        manager = get_license_manager()
+        manager = _mgr()
         license_key = manager.load_license_key()
         
         if not license_key:
@@ -139,13 +183,14 @@ def verify_existing_license() -> bool:
             return False
         
         print("🔄 Verifying license with server...")
-        is_valid, message = manager.verify_license(license_key)
+        # An explicit check must reach the server, not reuse a memoized result
+        is_valid, message, has_features = manager.verify_with_features(license_key, refresh=True)
         
         if is_valid:
             print(f"✅ {message}")
             
             # Check features
-            if manager.has_required_features():
+            if has_features:
                 print("🎉 License includes required YAML Translator features!")
             else:
                 print("⚠️  License is valid but missing YAML Translator features")
@@ -165,8 +210,6 @@ def verify_existing_license() -> bool:
 def clear_license() -> bool:
     """Clear the stored license key."""
     try:
-        from license_system.license_manager import get_license_manager
-        
         print("🗑️  Clear License Key")
         print("─" * 25)
         print("⚠️  This will remove your stored license key.")
@@ -176,7 +219,7 @@ def clear_license() -> bool:
         confirm = input("Are you sure? (y/N): ").strip().lower()
         
         if confirm in ['y', 'yes']:
-            manager = get_license_manager()
+            manager = _mgr()
             if manager.clear_license():
                 print("✅ License key cleared successfully")
                 return True
@@ -194,43 +237,52 @@ def clear_license() -> bool:
         print(f"❌ Error clearing license: {e}")
         return False
 
+_PURCHASE_INFO = (
+    "🛒 Purchase License Information\n"
+    "───────────────────────────────────\n"
+    "\n"
+    "To purchase a license for YAML Translator Tool:\n"
+    "\n"
+    "🌐 Website: https://store.steamdb.fun\n"
+    "📧 Email: contact@bali0531.hu\n"
+    "\n"
+    "License Features Required:\n"
+    "• 🎯 Feature 1: YAML Translator (specific to this application)\n"
+    "• 🌟 Feature 8: All Features (includes everything)\n"
+    "\n"
+    "⚠️  Important: Standard licenses without these features won't work!\n"
+    "\n"
+    "License Benefits:\n"
+    "• ✅ Unlimited YAML file translations\n"
+    "• ✅ All supported languages (25+)\n"
+    "• ✅ Batch processing capabilities\n"
+    "• ✅ Advanced formatting options\n"
+    "• ✅ Priority support\n"
+    "\n"
+    "💰 Pricing starts at $4.99 for YAML Translator license\n"
+    "🏢 Volume discounts available for multiple users\n"
+    "🌟 All Features license includes future applications\n"
+    "\n")
+
 def show_purchase_info():
     """Display information about purchasing a license."""
-    print("🛒 Purchase License Information")
-    print("─" * 35)
-    print()
-    print("To purchase a license for YAML Translator Tool:")
-    print()
-    print("🌐 Website: https://store.steamdb.fun")
-    print("📧 Email: contact@bali0531.hu")
-    print()
-    print("License Features Required:")
-    print("• 🎯 Feature 1: YAML Translator (specific to this application)")
-    print("• 🌟 Feature 8: All Features (includes everything)")
-    print()
-    print("⚠️  Important: Standard licenses without these features won't work!")
-    print()
-    print("License Benefits:")
-    print("• ✅ Unlimited YAML file translations")
-    print("• ✅ All supported languages (25+)")
-    print("• ✅ Batch processing capabilities")
-    print("• ✅ Advanced formatting options")
-    print("• ✅ Priority support")
-    print()
-    print("💰 Pricing starts at $4.99 for YAML Translator license")
-    print("🏢 Volume discounts available for multiple users")
-    print("🌟 All Features license includes future applications")
-    print()
+    sys.stdout.write(_PURCHASE_INFO)
 
 def license_menu():
     """Main license management menu."""
+    # Only entering, verifying or clearing a key can change the status shown
+    status_dirty = True
     while True:
         try:
             clear_screen()
             show_license_banner()
             
             # Show current status
-            is_licensed = display_license_status()
+            if status_dirty:
+                is_licensed = display_license_status()
+                status_dirty = False
+            else:
+                is_licensed = _reprint_cached_status()
             
             print("📋 License Management Options:")
             print("─" * 35)
@@ -245,6 +297,7 @@ def license_menu():
             
             if choice == '1':
                 print("\n" + "=" * 50)
+                status_dirty = True
                 if enter_license_key():
                     input("\n⏸️  Press Enter to continue...")
                 else:
@@ -252,11 +305,13 @@ def license_menu():
                     
             elif choice == '2':
                 print("\n" + "=" * 50)
+                status_dirty = True
                 verify_existing_license()
                 input("\n⏸️  Press Enter to continue...")
                 
             elif choice == '3':
                 print("\n" + "=" * 50)
+                status_dirty = True
                 clear_license()
                 input("\n⏸️  Press Enter to continue...")
                 
@@ -282,14 +337,14 @@ def license_menu():
 def quick_license_check() -> bool:
     """Quick license check for application startup."""
     try:
-        from license_system.license_manager import get_license_manager
-        
-        manager = get_license_manager()
-        if not manager.is_license_valid():
+        manager = _mgr()
+        license_key = manager.load_license_key()
+        if not license_key:
             return False
         
-        # Check if license has required features
-        return manager.has_required_features()
+        # Validity and features come from the same verification
+        result = _check_all(manager, license_key)
+        return result['is_valid'] and result['has_features']
         
     except ImportError:
         print("⚠️  License system not available - running in trial mode")
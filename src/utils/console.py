@@ -0,0 +1,36 @@
+"""
+Console helpers shared by the main and license menus
+"""
+
+import os
+import sys
+
+_ANSI_CLEAR = "\x1b[2J\x1b[H"
+
+def _enable_ansi() -> bool:
+    """Return True if the console understands ANSI escapes, enabling them on Windows."""
+    try:
+        if not sys.stdout.isatty():
+            return False
+        if os.name != 'nt':
+            return True
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)  # STD_OUTPUT_HANDLE
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
+
+_USE_ANSI = _enable_ansi()
+
+def clear_screen():
+    """Clear the console screen."""
+    if _USE_ANSI:
+        sys.stdout.write(_ANSI_CLEAR)
+        sys.stdout.flush()
+    else:
+        os.system('cls' if os.name == 'nt' else 'clear')
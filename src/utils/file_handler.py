@@ -1,8 +1,17 @@
+import os
+import yaml
+
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    # Fall back to the pure-Python implementation without libyaml
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
 def read_yaml_file(file_path):
     """Read a YAML file and return its contents."""
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            return yaml.safe_load(file)
+            return yaml.load(file, Loader=_Loader)
     except FileNotFoundError:
         print(f"Error: File '{file_path}' not found.")
         return None
@@ -11,13 +20,25 @@ def read_yaml_file(file_path):
         return None
 
 def write_yaml_file(file_path, data):
-    """Write data to a YAML file."""
+    """Write data to a YAML file, replacing it atomically.
+
+    Serialization and write errors propagate to the caller.
+    """
+    # One write of the whole document instead of many small ones
+    payload = yaml.dump(data, default_flow_style=False, allow_unicode=True, sort_keys=False,
+                        Dumper=_Dumper, encoding='utf-8')
+    tmp_file = f"{file_path}.tmp"
     try:
-        with open(file_path, 'w', encoding='utf-8') as file:
-            yaml.dump(data, file, default_flow_style=False, allow_unicode=True, sort_keys=False)
-    except Exception as e:
-        print(f"Error writing to YAML file: {e}")
+        with open(tmp_file, 'wb') as file:
+            file.write(payload)
+        os.replace(tmp_file, file_path)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
 
 def file_exists(file_path):
     """Check if a file exists."""
-    return Path(file_path).is_file()
\ No newline at end of file
+    return os.path.isfile(file_path)
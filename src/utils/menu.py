@@ -1,63 +1,115 @@
 import os
 import sys
-from pathlib import Path
+import stat
+import time
 
-def clear_screen():
-    """Clear the console screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+from utils.console import clear_screen
+
+# Feature modules are resolved once here; a missing one leaves None and
+# its handler reports it instead of failing the whole menu
+try:
+    from license_system.license_manager import get_license_manager
+except ImportError:
+    get_license_manager = None
+
+try:
+    from license_system.license_menu import license_menu, enter_license_key
+except ImportError:
+    license_menu = enter_license_key = None
+
+try:
+    from core.translator import Translator
+except ImportError:
+    Translator = None
+
+try:
+    from core.formatter import Formatter
+except ImportError:
+    Formatter = None
+
+try:
+    from core.reverser import Reverser
+except ImportError:
+    Reverser = None
+
+try:
+    from config.settings import get_stored_api_key, save_api_key, display_settings, modify_settings
+except ImportError:
+    get_stored_api_key = save_api_key = display_settings = modify_settings = None
+
+try:
+    from utils.telemetry import get_translation_history
+except ImportError:
+    get_translation_history = None
+
+def _ask(prompt, lower=False):
+    """Prompt for input, trimming whitespace and drag & drop quotes."""
+    answer = input(prompt).strip().strip('"')
+    return answer.lower() if lower else answer
+
+# Static menu frames, built once and written in a single call
+_MAIN_MENU = "\n".join([
+    "╔" + "═" * 60 + "╗",
+    "║" + " " * 15 + "🔧 YAML Translator Tool 🔧" + " " * 15 + "║",
+    "╠" + "═" * 60 + "╣",
+    "║  1. 🌐 Translate YAML File                            ║",
+    "║  2. 🔤 Convert YAML to Small Caps                     ║",
+    "║  3. 🔄 Reverse Small Caps to Normal Text              ║",
+    "║  4. ⚙️  Settings & Configuration                       ║",
+    "║  5. 📊 View Translation History                       ║",
+    "║  6. 🔑 License Management                             ║",
+    "║  0. 🚪 Exit                                           ║",
+    "╚" + "═" * 60 + "╝",
+]) + "\n"
+
+_FILE_SELECTION_MENU = "\n".join([
+    "\n📁 File Selection:",
+    "1. Enter file path manually",
+    "2. Browse current directory",
+    "3. Use drag & drop (paste path)",
+    "0. Back to main menu",
+]) + "\n"
+
+_LANGUAGE_LIST_HEADER = "\n📜 Supported Languages:\n" + "=" * 60 + "\n"
 
 def display_main_menu():
     """Display the main menu with enhanced formatting."""
     clear_screen()
-    print("╔" + "═" * 60 + "╗")
-    print("║" + " " * 15 + "🔧 YAML Translator Tool 🔧" + " " * 15 + "║")
-    print("╠" + "═" * 60 + "╣")
-    print("║  1. 🌐 Translate YAML File                            ║")
-    print("║  2. 🔤 Convert YAML to Small Caps                     ║")
-    print("║  3. 🔄 Reverse Small Caps to Normal Text              ║")
-    print("║  4. ⚙️  Settings & Configuration                       ║")
-    print("║  5. 📊 View Translation History                       ║")
-    print("║  6. 🔑 License Management                             ║")
-    print("║  0. 🚪 Exit                                           ║")
-    print("╚" + "═" * 60 + "╝")
+    sys.stdout.write(_MAIN_MENU)
 
 def display_file_selection_menu():
     """Display file selection options."""
-    print("\n📁 File Selection:")
-    print("1. Enter file path manually")
-    print("2. Browse current directory")
-    print("3. Use drag & drop (paste path)")
-    print("0. Back to main menu")
+    sys.stdout.write(_FILE_SELECTION_MENU)
 
 def get_yaml_files_in_directory(directory="."):
-    """Get all YAML files in the specified directory."""
+    """Yield (name, size_kb, path) for each YAML file in the specified directory."""
     try:
-        yaml_files = []
-        for file in Path(directory).iterdir():
-            if file.is_file() and file.suffix.lower() in ['.yml', '.yaml']:
-                yaml_files.append(file)
-        return yaml_files
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Name check first; is_file() uses the cached d_type, so
+                # only symlinks cost a stat
+                if entry.name.lower().endswith(('.yml', '.yaml')) and entry.is_file():
+                    yield entry.name, entry.stat().st_size / 1024, entry.path
     except Exception as e:
         print(f"❌ Error reading directory: {e}")
-        return []
 
 def select_file():
     """Enhanced file selection with multiple options."""
     while True:
         display_file_selection_menu()
-        choice = input("\n👉 Select option: ").strip()
+        choice = _ask("\n👉 Select option: ")
         
         if choice == '0':
             return None
         elif choice == '1':
-            file_path = input("\n📝 Enter YAML file path: ").strip().strip('"')
+            file_path = _ask("\n📝 Enter YAML file path: ")
             if validate_yaml_file(file_path):
                 return file_path
         elif choice == '2':
             return browse_directory()
         elif choice == '3':
             print("\n📋 Paste the file path here (you can drag & drop the file):")
-            file_path = input("Path: ").strip().strip('"')
+            file_path = _ask("Path: ")
             if validate_yaml_file(file_path):
                 return file_path
         else:
@@ -65,27 +117,47 @@ def select_file():
         
         input("\n⏸️  Press Enter to continue...")
 
-def browse_directory():
-    """Browse and select files from current directory."""
-    yaml_files = get_yaml_files_in_directory()
+# Listed files are written to the screen in groups of this many lines
+_BROWSE_FLUSH_EVERY = 50
+
+def browse_directory(max_entries=500):
+    """Browse and select files from current directory.
+    
+    Files are listed as they are found; after every max_entries the user
+    can stop and pick from what has been shown so far.
+    """
+    yaml_files = []
+    lines = ["\n📂 YAML files:"]
+    found = get_yaml_files_in_directory()
+    for name, file_size, path in found:
+        if yaml_files and len(yaml_files) % max_entries == 0:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines = []
+            more = _ask(f"❓ Showing {len(yaml_files)} files. Show more? (y/n): ", lower=True)
+            if more not in ['y', 'yes']:
+                break
+        yaml_files.append(path)
+        lines.append(f"  {len(yaml_files)}. {name} ({file_size:.1f} KB)")
+        if len(lines) >= _BROWSE_FLUSH_EVERY:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines = []
+    # Release the directory handle if the listing was cut short
+    found.close()
     
     if not yaml_files:
         print("\n❌ No YAML files found in current directory.")
         return None
     
-    print(f"\n📂 Found {len(yaml_files)} YAML file(s):")
-    for i, file in enumerate(yaml_files, 1):
-        file_size = file.stat().st_size / 1024  # Size in KB
-        print(f"  {i}. {file.name} ({file_size:.1f} KB)")
-    
-    print("  0. Back")
+    lines.append(f"📂 {len(yaml_files)} YAML file(s) listed")
+    lines.append("  0. Back")
+    sys.stdout.write("\n".join(lines) + "\n")
     
     try:
-        choice = int(input("\n👉 Select file number: "))
+        choice = int(_ask("\n👉 Select file number: "))
         if choice == 0:
             return None
         elif 1 <= choice <= len(yaml_files):
-            return str(yaml_files[choice - 1])
+            return yaml_files[choice - 1]
         else:
             print("❌ Invalid file number.")
             return None
@@ -99,27 +171,30 @@ def validate_yaml_file(file_path):
         print("❌ No file path provided.")
         return False
     
-    path = Path(file_path)
-    if not path.exists():
-        print(f"❌ File not found: {file_path}")
+    # Extension first so a wrong file type costs no stat at all
+    if not file_path.lower().endswith(('.yml', '.yaml')):
+        print(f"❌ File is not a YAML file: {file_path}")
         return False
     
-    if not path.is_file():
-        print(f"❌ Path is not a file: {file_path}")
+    # One stat answers both "exists" and "is a file"
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        print(f"❌ File not found: {file_path}")
         return False
     
-    if path.suffix.lower() not in ['.yml', '.yaml']:
-        print(f"❌ File is not a YAML file: {file_path}")
+    if not stat.S_ISREG(st.st_mode):
+        print(f"❌ Path is not a file: {file_path}")
         return False
     
-    print(f"✅ Valid YAML file: {path.name}")
+    print(f"✅ Valid YAML file: {os.path.basename(file_path)}")
     return True
 
 def get_user_choice():
     """Get user choice with validation."""
     while True:
         try:
-            choice = input("\n👉 Select option: ").strip()
+            choice = _ask("\n👉 Select option: ")
             return choice
         except KeyboardInterrupt:
             print("\n\n🚪 Exiting...")
@@ -148,13 +223,13 @@ def handle_menu_selection(choice):
 
 def check_license_for_feature(feature_name):
     """Check if user has valid license for a specific feature."""
+    if get_license_manager is None:
+        print("⚠️  License system not available - feature available in trial mode")
+        return True
+    
     try:
-        from license_system.license_manager import get_license_manager
-        
-        manager = get_license_manager()
-        
-        # Check if license has required features
-        has_features, message = manager.has_required_features()
+        # Check if license has required features; the manager memoizes the validation
+        has_features, message = get_license_manager().has_required_features()
         
         if not has_features:
             print(f"\n🔒 License Required for {feature_name.title()}")
@@ -163,9 +238,11 @@ def check_license_for_feature(feature_name):
             print()
             
             if "No license key found" in message:
-                choice = input("❓ Would you like to enter your license key now? (y/n): ").strip().lower()
+                choice = _ask("❓ Would you like to enter your license key now? (y/n): ", lower=True)
                 if choice in ['y', 'yes']:
-                    from license_system.license_menu import enter_license_key
+                    if enter_license_key is None:
+                        print("❌ License management not available.")
+                        return False
                     return enter_license_key()
                 else:
                     print("💡 You can manage your license from the main menu (option 6)")
@@ -195,9 +272,7 @@ def handle_translation():
     if not check_license_for_feature("translation"):
         return
     
-    try:
-        from core.translator import Translator
-    except ImportError:
+    if Translator is None:
         print("❌ Translation module not found. Please check installation.")
         input("\n⏸️  Press Enter to continue...")
         return
@@ -236,9 +311,7 @@ def handle_formatting():
     if not check_license_for_feature("formatting"):
         return
         
-    try:
-        from core.formatter import Formatter
-    except ImportError:
+    if Formatter is None:
         print("❌ Formatter module not found. Please check installation.")
         input("\n⏸️  Press Enter to continue...")
         return
@@ -265,9 +338,7 @@ def handle_reversing():
     if not check_license_for_feature("reversing"):
         return
         
-    try:
-        from core.reverser import Reverser
-    except ImportError:
+    if Reverser is None:
         print("❌ Reverser module not found. Please check installation.")
         input("\n⏸️  Press Enter to continue...")
         return
@@ -288,37 +359,40 @@ def handle_reversing():
     
     input("\n⏸️  Press Enter to return to main menu...")
 
+LANGUAGES = {
+    'en': 'English',
+    'es': 'Spanish (Español)',
+    'fr': 'French (Français)',
+    'de': 'German (Deutsch)',
+    'it': 'Italian (Italiano)',
+    'pt': 'Portuguese (Português)',
+    'ru': 'Russian (Русский)',
+    'zh': 'Chinese (中文)',
+    'ja': 'Japanese (日本語)',
+    'ko': 'Korean (한국어)',
+    'ar': 'Arabic (العربية)',
+    'hi': 'Hindi (हिन्दी)',
+    'hu': 'Hungarian (Magyar)',
+    'pl': 'Polish (Polski)',
+    'cs': 'Czech (Čeština)',
+    'sk': 'Slovak (Slovenčina)',
+    'ro': 'Romanian (Română)',
+    'bg': 'Bulgarian (Български)',
+    'hr': 'Croatian (Hrvatski)',
+    'sr': 'Serbian (Српски)',
+    'nl': 'Dutch (Nederlands)',
+    'tr': 'Turkish (Türkçe)',
+    'sv': 'Swedish (Svenska)',
+    'no': 'Norwegian (Norsk)',
+    'da': 'Danish (Dansk)',
+    'fi': 'Finnish (Suomi)'
+}
+
+# Lowercased names for the substring search in select_language
+_LANG_NAMES_LOWER = [(code, name, name.lower()) for code, name in LANGUAGES.items()]
+
 def select_language():
     """Language selection with search functionality."""
-    languages = {
-        'en': 'English',
-        'es': 'Spanish (Español)',
-        'fr': 'French (Français)', 
-        'de': 'German (Deutsch)',
-        'it': 'Italian (Italiano)',
-        'pt': 'Portuguese (Português)',
-        'ru': 'Russian (Русский)',
-        'zh': 'Chinese (中文)',
-        'ja': 'Japanese (日本語)',
-        'ko': 'Korean (한국어)',
-        'ar': 'Arabic (العربية)',
-        'hi': 'Hindi (हिन्दी)',
-        'hu': 'Hungarian (Magyar)',
-        'pl': 'Polish (Polski)',
-        'cs': 'Czech (Čeština)',
-        'sk': 'Slovak (Slovenčina)',
-        'ro': 'Romanian (Română)',
-        'bg': 'Bulgarian (Български)',
-        'hr': 'Croatian (Hrvatski)',
-        'sr': 'Serbian (Српски)',
-        'nl': 'Dutch (Nederlands)',
-        'tr': 'Turkish (Türkçe)',
-        'sv': 'Swedish (Svenska)',
-        'no': 'Norwegian (Norsk)',
-        'da': 'Danish (Dansk)',
-        'fi': 'Finnish (Suomi)'
-    }
-    
     print("\n🌍 Language Selection")
     print("=" * 40)
     print("💡 You can:")
@@ -328,22 +402,22 @@ def select_language():
     print("   • Type '0' to go back")
     
     while True:
-        choice = input("\n🗣️  Enter target language: ").strip().lower()
+        choice = _ask("\n🗣️  Enter target language: ", lower=True)
         
         if choice == '0':
             return None
         elif choice == 'list':
-            display_language_list(languages)
+            display_language_list(LANGUAGES)
             continue
-        elif choice in languages:
-            print(f"✅ Selected: {languages[choice]}")
+        elif choice in LANGUAGES:
+            print(f"✅ Selected: {LANGUAGES[choice]}")
             return choice
         else:
             # Search by name
-            for code, name in languages.items():
-                if choice in name.lower():
+            for code, name, name_lower in _LANG_NAMES_LOWER:
+                if choice in name_lower:
                     print(f"✅ Found: {name} ({code})")
-                    confirm = input("❓ Use this language? (y/n): ").strip().lower()
+                    confirm = _ask("❓ Use this language? (y/n): ", lower=True)
                     if confirm in ['y', 'yes']:
                         return code
                     break
@@ -352,30 +426,29 @@ def select_language():
 
 def display_language_list(languages):
     """Display paginated language list."""
-    print("\n📜 Supported Languages:")
-    print("=" * 60)
+    sys.stdout.write(_LANGUAGE_LIST_HEADER)
     
+    items = list(languages.items())
     items_per_page = 15
-    total_pages = (len(languages) + items_per_page - 1) // items_per_page
+    total_pages = (len(items) + items_per_page - 1) // items_per_page
     current_page = 0
     
     while True:
         start_idx = current_page * items_per_page
-        end_idx = min(start_idx + items_per_page, len(languages))
+        end_idx = min(start_idx + items_per_page, len(items))
         
-        lang_items = list(languages.items())[start_idx:end_idx]
-        
-        for i, (code, name) in enumerate(lang_items, start_idx + 1):
-            print(f"  {i:2d}. {code:3s} - {name}")
-        
-        print(f"\nPage {current_page + 1}/{total_pages}")
+        # Each page is written in one call
+        out = [f"  {i:2d}. {code:3s} - {name}"
+               for i, (code, name) in enumerate(items[start_idx:end_idx], start_idx + 1)]
+        out.append(f"\nPage {current_page + 1}/{total_pages}")
         if current_page < total_pages - 1:
-            print("  'n' - Next page")
+            out.append("  'n' - Next page")
         if current_page > 0:
-            print("  'p' - Previous page")
-        print("  'q' - Back to language selection")
+            out.append("  'p' - Previous page")
+        out.append("  'q' - Back to language selection")
+        sys.stdout.write("\n".join(out) + "\n")
         
-        nav = input("\n👉 Navigation: ").strip().lower()
+        nav = _ask("\n👉 Navigation: ", lower=True)
         if nav == 'n' and current_page < total_pages - 1:
             current_page += 1
         elif nav == 'p' and current_page > 0:
@@ -385,18 +458,16 @@ def display_language_list(languages):
 
 def get_api_key():
     """Get API key with multiple options."""
-    try:
-        from config.settings import get_stored_api_key, save_api_key
-    except ImportError:
+    if get_stored_api_key is None:
         print("❌ Settings module not found. Using basic API key input.")
-        api_key = input("\n🔐 Enter OpenAI API key: ").strip()
+        api_key = _ask("\n🔐 Enter OpenAI API key: ")
         return api_key if api_key else None
     
     stored_key = get_stored_api_key()
     
     if stored_key:
         print(f"\n🔑 Found stored API key: {stored_key[:10]}...{stored_key[-4:]}")
-        use_stored = input("❓ Use stored API key? (y/n): ").strip().lower()
+        use_stored = _ask("❓ Use stored API key? (y/n): ", lower=True)
         if use_stored in ['y', 'yes']:
             return stored_key
     
@@ -407,15 +478,15 @@ def get_api_key():
     print("   2. Set API key in environment variable")
     print("   0. Back to main menu")
     
-    choice = input("\n👉 Select option: ").strip()
+    choice = _ask("\n👉 Select option: ")
     
     if choice == '0':
         return None
     elif choice == '1':
-        api_key = input("\n🔐 Enter OpenAI API key: ").strip()
+        api_key = _ask("\n🔐 Enter OpenAI API key: ")
         if api_key:
             try:
-                save_option = input("💾 Save this API key for future use? (y/n): ").strip().lower()
+                save_option = _ask("💾 Save this API key for future use? (y/n): ", lower=True)
                 if save_option in ['y', 'yes']:
                     save_api_key(api_key)
             except:
@@ -436,9 +507,7 @@ def get_api_key():
 
 def handle_settings():
     """Handle settings and configuration."""
-    try:
-        from config.settings import display_settings, modify_settings
-    except ImportError:
+    if display_settings is None:
         print("❌ Settings module not found. Basic settings not available.")
         input("\n⏸️  Press Enter to continue...")
         return
@@ -458,7 +527,7 @@ def handle_settings():
         print("  5. Import settings")
         print("  0. Back to main menu")
         
-        choice = input("\n👉 Select option: ").strip()
+        choice = _ask("\n👉 Select option: ")
         
         if choice == '0':
             break
@@ -478,9 +547,7 @@ def handle_settings():
 
 def handle_history():
     """Handle translation history viewing."""
-    try:
-        from utils.telemetry import get_translation_history
-    except ImportError:
+    if get_translation_history is None:
         print("❌ History module not found. History not available.")
         input("\n⏸️  Press Enter to continue...")
         return
@@ -494,24 +561,27 @@ def handle_history():
     if not history:
         print("📭 No translation history found.")
     else:
+        lines = []
         for i, entry in enumerate(history, 1):
-            print(f"\n{i}. {entry.get('timestamp', 'Unknown time')}")
-            print(f"   📁 File: {entry.get('file', 'Unknown')}")
-            print(f"   🌍 Language: {entry.get('language', 'Unknown')}")
-            print(f"   ⏱️  Duration: {entry.get('duration', 'Unknown')}")
-            print(f"   📊 Status: {entry.get('status', 'Unknown')}")
+            lines.append(f"\n{i}. {entry.get('timestamp', 'Unknown time')}")
+            lines.append(f"   📁 File: {entry.get('file', 'Unknown')}")
+            lines.append(f"   🌍 Language: {entry.get('language', 'Unknown')}")
+            lines.append(f"   ⏱️  Duration: {entry.get('duration', 'Unknown')}")
+            lines.append(f"   📊 Status: {entry.get('status', 'Unknown')}")
+        sys.stdout.write("\n".join(lines) + "\n")
     
     input("\n⏸️  Press Enter to return to main menu...")
 
 def handle_license_management():
     """Handle license management workflow."""
-    try:
-        from license_system.license_menu import license_menu
-        license_menu()
-    except ImportError:
+    if license_menu is None:
         print("❌ License management not available.")
         print("💡 Please ensure the licensing module is properly installed.")
         input("\n⏸️  Press Enter to continue...")
+        return
+    
+    try:
+        license_menu()
     except Exception as e:
         print(f"❌ Error accessing license management: {e}")
         input("\n⏸️  Press Enter to continue...")
@@ -2,11 +2,24 @@
 Telemetry and performance tracking for YAML Translator Tool
 """
 
+import os
+import sys
 import time
 import json
+from array import array
 from pathlib import Path
+from collections import deque
 from datetime import datetime
-from functools import wraps
+from functools import lru_cache, wraps
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    # Fallback to the standard library if orjson is not available
+    from json import loads as _json_loads
+    
+    def _json_dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
 
 try:
     from config.settings import get_setting
@@ -21,18 +34,39 @@ except ImportError:
             return defaults.get(category, {})
         return defaults.get(category, {}).get(key, True)
 
+# Settings consulted on every call, cached here. They are loaded on first
+# use so importing this module does not build Settings; settings.modify_settings()
+# calls refresh_cached_settings() after a change
+_DETAILED_LOGGING = _SHOW_PROGRESS = _AUTO_SAVE = _MAX_ENTRIES = None
+_settings_loaded = False
+
+def refresh_cached_settings():
+    """Re-read the settings cached by this module."""
+    global _DETAILED_LOGGING, _SHOW_PROGRESS, _AUTO_SAVE, _MAX_ENTRIES, _settings_loaded
+    _DETAILED_LOGGING = get_setting('ui', 'detailed_logging')
+    _SHOW_PROGRESS = get_setting('ui', 'show_progress')
+    _AUTO_SAVE = get_setting('history', 'auto_save')
+    _MAX_ENTRIES = get_setting('history', 'max_entries')
+    _settings_loaded = True
+
+def _ensure_settings():
+    """Load the cached settings if nothing has read them yet."""
+    if not _settings_loaded:
+        refresh_cached_settings()
+
 def track_performance(func):
     """Decorator to track function performance."""
+    name = func.__name__
+    perf_counter = time.perf_counter
+    
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
+        _ensure_settings()
+        if not _DETAILED_LOGGING:
+            return func(*args, **kwargs)
+        start_time = perf_counter()
         result = func(*args, **kwargs)
-        end_time = time.time()
-        execution_time = end_time - start_time
-        
-        if get_setting('ui', 'detailed_logging'):
-            print(f"⏱️  {func.__name__}: {execution_time:.4f}s")
-        
+        print(f"⏱️  {name}: {perf_counter() - start_time:.4f}s")
         return result
     return wrapper
 
@@ -40,153 +74,221 @@ def format_time(seconds):
     """Format time in human-readable format."""
     if seconds < 1:
         return f"{int(seconds * 1000)}ms"
-    elif seconds < 60:
+    if seconds < 60:
         return f"{seconds:.1f}s"
-    elif seconds < 3600:
-        return f"{int(seconds // 60)}m {int(seconds % 60)}s"
-    else:
-        hours = int(seconds // 3600)
-        minutes = int((seconds % 3600) // 60)
-        return f"{hours}h {minutes}m"
+    minutes, secs = divmod(int(seconds), 60)
+    if minutes < 60:
+        return f"{minutes}m {secs}s"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h {minutes}m"
 
 def format_timestamp(timestamp):
     """Format timestamp."""
     return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
 
+# Batch states stored in BatchTelemetry.status
+BATCH_PENDING, BATCH_RUNNING, BATCH_COMPLETED = 0, 1, 2
+
+_UNSET = float('nan')
+
+def _percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted, non-empty list."""
+    rank = max(int(-(-pct * len(sorted_values) // 100)), 1)
+    return sorted_values[rank - 1]
+
 class BatchTelemetry:
     def __init__(self, total_batches):
         self.total_batches = total_batches
-        self.batches = []
-        for i in range(total_batches):
-            self.batches.append({
-                'started': None,
-                'finished': None,
-                'api_start': None,
-                'api_end': None,
-                'file_start': None,
-                'file_end': None,
-                'status': 'pending'
-            })
+        # One column of timestamps per event (NaN until set) instead of a
+        # dict per batch; status holds BATCH_* codes
+        self.started = array('d', [_UNSET]) * total_batches
+        self.finished = array('d', [_UNSET]) * total_batches
+        self.api_start = array('d', [_UNSET]) * total_batches
+        self.api_end = array('d', [_UNSET]) * total_batches
+        self.file_start = array('d', [_UNSET]) * total_batches
+        self.file_end = array('d', [_UNSET]) * total_batches
+        self.status = bytearray(total_batches)
+        # Events are timed with perf_counter; this offset turns a reading
+        # back into wall-clock time for display
+        self._wall_offset = time.time() - time.perf_counter()
     
     def start_batch(self, batch_idx):
-        self.batches[batch_idx]['started'] = time.time()
-        self.batches[batch_idx]['status'] = 'running'
+        self.started[batch_idx] = time.perf_counter()
+        self.status[batch_idx] = BATCH_RUNNING
     
     def start_api(self, batch_idx):
-        self.batches[batch_idx]['api_start'] = time.time()
+        self.api_start[batch_idx] = time.perf_counter()
     
     def end_api(self, batch_idx):
-        self.batches[batch_idx]['api_end'] = time.time()
+        self.api_end[batch_idx] = time.perf_counter()
     
     def start_file_ops(self, batch_idx):
-        self.batches[batch_idx]['file_start'] = time.time()
+        self.file_start[batch_idx] = time.perf_counter()
     
     def end_file_ops(self, batch_idx):
-        self.batches[batch_idx]['file_end'] = time.time()
+        self.file_end[batch_idx] = time.perf_counter()
     
     def finish_batch(self, batch_idx):
-        self.batches[batch_idx]['finished'] = time.time()
-        self.batches[batch_idx]['status'] = 'completed'
+        self.finished[batch_idx] = time.perf_counter()
+        self.status[batch_idx] = BATCH_COMPLETED
+    
+    @staticmethod
+    def _span(starts, ends, batch_idx):
+        span = ends[batch_idx] - starts[batch_idx]
+        return None if span != span else span  # NaN: not both set yet
     
     def get_batch_time(self, batch_idx):
-        batch = self.batches[batch_idx]
-        if batch['started'] and batch['finished']:
-            return batch['finished'] - batch['started']
-        return None
+        return self._span(self.started, self.finished, batch_idx)
     
     def get_api_time(self, batch_idx):
-        batch = self.batches[batch_idx]
-        if batch['api_start'] and batch['api_end']:
-            return batch['api_end'] - batch['api_start']
-        return None
+        return self._span(self.api_start, self.api_end, batch_idx)
     
     def get_file_time(self, batch_idx):
-        batch = self.batches[batch_idx]
-        if batch['file_start'] and batch['file_end']:
-            return batch['file_end'] - batch['file_start']
-        return None
+        return self._span(self.file_start, self.file_end, batch_idx)
+    
+    def get_api_wall_time(self):
+        """Wall-clock time with at least one API call in flight (overlaps counted once)."""
+        spans = sorted((s, e) for s, e in zip(self.api_start, self.api_end) if e - s == e - s)
+        total = 0.0
+        cur_start = cur_end = None
+        for start, end in spans:
+            if cur_end is None or start > cur_end:
+                if cur_end is not None:
+                    total += cur_end - cur_start
+                cur_start, cur_end = start, end
+            elif end > cur_end:
+                cur_end = end
+        if cur_end is not None:
+            total += cur_end - cur_start
+        return total
     
     def print_status(self):
-        if not get_setting('ui', 'show_progress'):
+        _ensure_settings()
+        if not _SHOW_PROGRESS:
             return
-            
-        print("\n" + "="*80)
-        print("📊 BATCH TELEMETRY")
-        print("="*80)
         
-        for i, batch in enumerate(self.batches, 1):
-            if batch['status'] == 'completed':
-                start_time = format_timestamp(batch['started'])
-                end_time = format_timestamp(batch['finished'])
+        wall = self._wall_offset
+        now = time.perf_counter()
+        # The whole table goes out in one write
+        out = ["\n" + "="*80, "📊 BATCH TELEMETRY", "="*80]
+        
+        for i, status in enumerate(self.status, 1):
+            if status == BATCH_COMPLETED:
+                start_time = format_timestamp(wall + self.started[i-1])
+                end_time = format_timestamp(wall + self.finished[i-1])
                 elapsed = format_time(self.get_batch_time(i-1))
-                api_time = format_time(self.get_api_time(i-1)) if self.get_api_time(i-1) else "N/A"
-                file_time = format_time(self.get_file_time(i-1)) if self.get_file_time(i-1) else "N/A"
+                api_span = self.get_api_time(i-1)
+                file_span = self.get_file_time(i-1)
+                api_time = format_time(api_span) if api_span else "N/A"
+                file_time = format_time(file_span) if file_span else "N/A"
                 
-                print(f"{i:2d}. batch - ✅ Started: {start_time} - Finished: {end_time} - Total: {elapsed} (API: {api_time}, File: {file_time})")
+                out.append(f"{i:2d}. batch - ✅ Started: {start_time} - Finished: {end_time} - Total: {elapsed} (API: {api_time}, File: {file_time})")
             
-            elif batch['status'] == 'running':
-                start_time = format_timestamp(batch['started'])
-                elapsed = format_time(time.time() - batch['started'])
-                print(f"{i:2d}. batch - 🔄 Started: {start_time} - Running... - Elapsed: {elapsed}")
+            elif status == BATCH_RUNNING:
+                start_time = format_timestamp(wall + self.started[i-1])
+                elapsed = format_time(now - self.started[i-1])
+                out.append(f"{i:2d}. batch - 🔄 Started: {start_time} - Running... - Elapsed: {elapsed}")
             
             else:  # pending
-                print(f"{i:2d}. batch - ⏳ Waiting...")
+                out.append(f"{i:2d}. batch - ⏳ Waiting...")
+        
+        sys.stdout.write("\n".join(out) + "\n")
     
     def print_final_summary(self, total_start_time, total_items, translated_items):
-        total_time = time.time() - total_start_time
-        total_api_time = sum(self.get_api_time(i) or 0 for i in range(len(self.batches)))
-        total_file_time = sum(self.get_file_time(i) or 0 for i in range(len(self.batches)))
-        processing_time = total_time - total_api_time - total_file_time
+        # total_start_time is a time.perf_counter() reading
+        total_time = time.perf_counter() - total_start_time
+        api_times = sorted(t for t in map(float.__sub__, self.api_end, self.api_start) if t == t)
+        total_api_time = sum(api_times)
+        # Batches overlap, so API time is reported as wall-clock time with a
+        # request in flight; the per-batch sum can exceed the run time
+        api_wall_time = self.get_api_wall_time()
+        total_file_time = sum(t for t in map(float.__sub__, self.file_end, self.file_start) if t == t)
+        # Checkpoint writes run beside API calls, so this can still dip below 0
+        processing_time = max(total_time - api_wall_time - total_file_time, 0)
+        # Percent of wall time; a run that measured no time reports 0%
+        inv = 100.0 / total_time if total_time > 0 else 0.0
         
         print("\n" + "="*80)
         print("🎯 FINAL SUMMARY")
         print("="*80)
         print(f"📁 Total items processed: {translated_items}/{total_items}")
         print(f"⏱️  Total time elapsed: {format_time(total_time)}")
-        print(f"🌐 API request time: {format_time(total_api_time)} ({total_api_time/total_time*100:.1f}%)")
-        print(f"💾 File operations time: {format_time(total_file_time)} ({total_file_time/total_time*100:.1f}%)")
-        print(f"⚙️  Processing time: {format_time(processing_time)} ({processing_time/total_time*100:.1f}%)")
-        print(f"⚡ Translation speed: {translated_items/total_time:.1f} items/sec")
-        print(f"📊 Completed batches: {sum(1 for b in self.batches if b['status'] == 'completed')}/{len(self.batches)}")
+        print(f"🌐 API request time: {format_time(api_wall_time)} ({api_wall_time*inv:.1f}%, "
+              f"{format_time(total_api_time)} summed over batches)")
+        if api_times:
+            print(f"📶 API latency per batch: p50 {format_time(_percentile(api_times, 50))}, "
+                  f"p95 {format_time(_percentile(api_times, 95))}")
+        print(f"💾 File operations time: {format_time(total_file_time)} ({total_file_time*inv:.1f}%)")
+        print(f"⚙️  Processing time: {format_time(processing_time)} ({processing_time*inv:.1f}%)")
+        print(f"⚡ Translation speed: {translated_items*inv/100:.1f} items/sec")
+        print(f"📊 Completed batches: {self.status.count(BATCH_COMPLETED)}/{self.total_batches}")
+
+# The history file may grow to this many times max_entries lines before
+# it is compacted back down to the newest max_entries
+HISTORY_COMPACT_FACTOR = 10
 
+@lru_cache(maxsize=1)
 def get_history_file():
-    """Get history file path."""
+    """Get history file path (one JSON entry per line, oldest first).
+    
+    Resolved once per process, creating its directory on the way.
+    """
     try:
-        from config.settings import _settings
-        return _settings.config_dir / 'history.json'
+        from config.settings import get_settings
+        history_file = get_settings().config_dir / 'history.jsonl'
     except ImportError:
-        return Path.home() / '.yaml-translator' / 'history.json'
+        history_file = Path.home() / '.yaml-translator' / 'history.jsonl'
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    _migrate_legacy_history(history_file)
+    return history_file
+
+def _migrate_legacy_history(history_file):
+    """Convert a newest-first history.json list into history.jsonl once."""
+    legacy_file = history_file.with_suffix('.json')
+    if history_file.exists() or not legacy_file.exists():
+        return
+    try:
+        with open(legacy_file, 'rb') as f:
+            history = _json_loads(f.read())
+        _write_history_lines(history_file, [_json_dumps(e) + b'\n' for e in reversed(history)])
+        legacy_file.unlink()
+    except Exception:
+        pass
+
+def _write_history_lines(history_file, lines):
+    """Replace the history file with lines, atomically."""
+    tmp_file = history_file.with_suffix('.jsonl.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.writelines(lines)
+    os.replace(tmp_file, history_file)
+
+def _compact_history(history_file, max_entries):
+    """Keep only the newest max_entries lines of the history file."""
+    with open(history_file, 'rb') as f:
+        lines = deque(f, maxlen=max_entries)
+    _write_history_lines(history_file, lines)
 
 def save_translation_history(entry):
     """Save translation history entry."""
-    if not get_setting('history', 'auto_save'):
+    _ensure_settings()
+    if not _AUTO_SAVE:
         return
     
     history_file = get_history_file()
-    history_file.parent.mkdir(exist_ok=True)
     
-    # Load existing history
-    history = []
-    if history_file.exists():
-        try:
-            with open(history_file, 'r') as f:
-                history = json.load(f)
-        except Exception:
-            pass
-    
-    # Add new entry
     entry['timestamp'] = datetime.now().isoformat()
-    history.insert(0, entry)  # Add to beginning
-    
-    # Limit history size
-    max_entries = get_setting('history', 'max_entries')
-    if len(history) > max_entries:
-        history = history[:max_entries]
+    line = _json_dumps(entry) + b'\n'
     
-    # Save history
+    # Append only; older entries are never re-read on save
     try:
-        with open(history_file, 'w') as f:
-            json.dump(history, f, indent=2)
+        with open(history_file, 'ab') as f:
+            f.write(line)
+            size = f.tell()
+        
+        # Estimate the line count from this entry's size rather than reading
+        # the file; compaction trims it back to the newest entries
+        if size > len(line) * _MAX_ENTRIES * HISTORY_COMPACT_FACTOR:
+            _compact_history(history_file, _MAX_ENTRIES)
     except Exception as e:
         print(f"⚠️  Could not save history: {e}")
 
@@ -194,16 +296,45 @@ def save_operation_history(entry):
     """Save operation history (formatting, reversing, etc.)."""
     save_translation_history(entry)
 
+def tail_jsonl(path, n, chunk_size=8192):
+    """Return the entries on the last n lines of a JSONL file, newest first.
+    
+    The file is read backwards in chunks, so only its tail is touched.
+    """
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b''
+        # n + 1 newlines guarantee n complete lines after the cut
+        while pos > 0 and data.count(b'\n') <= n:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    
+    lines = data.splitlines()
+    if pos > 0:
+        lines = lines[1:]  # Starts mid-line
+    
+    entries = []
+    for line in reversed(lines):
+        if len(entries) == n:
+            break
+        try:
+            entries.append(_json_loads(line))
+        except ValueError:
+            continue  # Skip a line torn by an interrupted write
+    return entries
+
 def get_translation_history():
-    """Get translation history."""
+    """Get translation history, newest first."""
     history_file = get_history_file()
     
     if not history_file.exists():
         return []
     
     try:
-        with open(history_file, 'r') as f:
-            return json.load(f)
+        _ensure_settings()
+        return tail_jsonl(history_file, _MAX_ENTRIES)
     except Exception:
         return []
 
@@ -230,6 +361,7 @@ class Telemetry:
         })
 
     def print_summary(self):
-        print("\nTelemetry Summary:")
-        for op in self.operations:
-            print(f"Operation: {op['operation']}, Status: {op['status']}, Duration: {op['duration']:.4f} seconds")
\ No newline at end of file
+        lines = ["\nTelemetry Summary:"]
+        lines.extend(f"Operation: {op['operation']}, Status: {op['status']}, Duration: {op['duration']:.4f} seconds"
+                     for op in self.operations)
+        sys.stdout.write("\n".join(lines) + "\n")
\ No newline at end of file
@@ -4,6 +4,7 @@ Comprehensive test script for any XML-like tag preservation in small caps conver
 Tests the new general pattern that preserves any <tag> or <tag:value> formatting.
 """
 
+import re
 import sys
 import os
 from pathlib import Path
@@ -15,8 +16,17 @@ sys.path.insert(0, str(src_dir))
 from core.formatter import to_small_caps
 from core.reverser import from_small_caps
 
-def test_all_tag_preservation():
-    """Test that any XML-like tags are preserved during small caps conversion."""
+# Tags whose presence in the output is checked, compiled once
+_XML_TAG_RE = re.compile(r'<[^>]*>')
+
+# Other formatting elements that must survive the conversion
+_OTHER_ELEMENTS = ("\\n", "%player%", "{world}", "&c")
+
+def test_all_tag_preservation(full=False):
+    """Test that any XML-like tags are preserved during small caps conversion.
+    
+    With full=True the round-trip back to normal text is printed as well.
+    """
     
     test_cases = [
         # Basic text
@@ -80,13 +90,12 @@ def test_all_tag_preservation():
             print("    ❌ FAILED - Small caps conversion")
             all_passed = False
         
-        # Test round-trip (back to normal)
-        restored = from_small_caps(result)
-        print(f"    Restored: {restored}")
+        # Show the round-trip (back to normal) only when asked for
+        if full:
+            print(f"    Restored: {from_small_caps(result)}")
         
         # Check if any XML-like tags are preserved
-        import re
-        xml_tags = re.findall(r'<[^>]*>', input_text)
+        xml_tags = _XML_TAG_RE.findall(input_text)
         formatting_preserved = True
         
         for tag in xml_tags:
@@ -97,8 +106,7 @@ def test_all_tag_preservation():
                 formatting_preserved = False
         
         # Check other formatting elements
-        other_elements = ["\\n", "%player%", "{world}", "&c"]
-        for element in other_elements:
+        for element in _OTHER_ELEMENTS:
             if element in input_text:
                 if element in result:
                     print(f"    ✅ PRESERVED: {element}")
@@ -119,4 +127,4 @@ def test_all_tag_preservation():
     return all_passed
 
 if __name__ == "__main__":
-    test_all_tag_preservation()
+    test_all_tag_preservation(full="--full" in sys.argv[1:])
@@ -17,11 +17,12 @@ def test_license_manager():
     print("=" * 50)
     
     try:
-        from license_system.license_manager import LicenseManager, get_license_manager
+        from license_system.license_manager import get_license_manager
         
-        # Test 1: Create license manager
+        # Test 1: Create license manager (the shared instance, so the menu
+        # tests below reuse its verification instead of repeating it)
         print("1. Creating license manager...")
-        manager = LicenseManager()
+        manager = get_license_manager()
         print("   ✅ License manager created successfully")
         
         # Test 2: Get machine code
@@ -38,7 +39,9 @@ def test_license_manager():
         
         # Test 4: Test global instance
         print("\n4. Testing global instance...")
-        global_manager = get_license_manager()
+        if get_license_manager() is not manager:
+            print("   ❌ get_license_manager() returned a new instance")
+            return False
         print("   ✅ Global license manager retrieved successfully")
         
         print("\n🎉 All license manager tests passed!")
@@ -3,23 +3,62 @@ Enhanced YAML Translator with improved placeholder handling and telemetry
 This is the updated version of your original translate.py with all improvements
 """
 
+import os
+import re
 import sys
+import json
 import yaml
 import time
+import threading
+from array import array
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
 from more_itertools import chunked
 from datetime import datetime
+from functools import lru_cache
+
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    # Fall back to the pure-Python loader/dumper without libyaml
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:
+    # Fallback to the standard library if orjson is not available
+    from json import loads as _json_loads
+    
+    def _json_dumps(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
+# "3. translated text" lines in the model's numbered reply; matched across the
+# whole reply at once, so whitespace is kept to spaces/tabs within a line
+_NUMBERED_LINE_RE = re.compile(r'^[ \t]*(\d+)\.[ \t]+(.*?)\r?$', re.MULTILINE)
+
+# Every batch is appended to the checkpoint; the full YAML is only rewritten
+# after this many finished batches (and at the end)
+SAVE_EVERY_BATCHES = 20
+
+# The telemetry table is reprinted after this many finished batches (and at the end)
+STATUS_EVERY_BATCHES = 10
 
 def flatten_yaml(d, prefix=""):
     """Flatten nested YAML structure."""
     items = {}
-    for k, v in d.items():
-        new_key = f"{prefix}.{k}" if prefix else k
-        if isinstance(v, dict):
-            items.update(flatten_yaml(v, new_key))
-        else:
+    # Stack of (dotted prefix, iterator) keeps document order without recursion
+    stack = [(f"{prefix}." if prefix else "", iter(d.items()))]
+    while stack:
+        parent, entries = stack[-1]
+        for k, v in entries:
+            new_key = f"{parent}{k}" if parent else k
+            if isinstance(v, dict):
+                stack.append((f"{new_key}.", iter(v.items())))
+                break
             items[new_key] = v
+        else:
+            stack.pop()
     return items
 
 def unflatten_yaml(d):
@@ -34,10 +73,37 @@ def unflatten_yaml(d):
     return result
 
 def save_progress(output_dict, out_file):
-    """Save progress after each batch."""
+    """Save progress, replacing out_file atomically."""
     rebuilt = unflatten_yaml(output_dict)
-    with open(out_file, "w", encoding="utf-8") as f:
-        yaml.dump(rebuilt, f, allow_unicode=True, default_flow_style=False, sort_keys=False)
+    # PyYAML writes in small pieces; build the text in memory and write it once
+    data = yaml.dump(rebuilt, allow_unicode=True, default_flow_style=False, sort_keys=False, Dumper=_Dumper)
+    tmp_file = f"{out_file}.tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        f.write(data)
+    os.replace(tmp_file, out_file)
+
+def append_checkpoint(fp, entries):
+    """Append one JSON line to a checkpoint opened in binary mode."""
+    fp.write(_json_dumps(entries) + b"\n")
+
+def load_checkpoint(ckpt_file, lang, source):
+    """Replay a checkpoint written for lang and source into a {key: translation} dict."""
+    translations = {}
+    try:
+        with open(ckpt_file, "rb") as f:
+            header = _json_loads(f.readline() or b"{}")
+            # A checkpoint from another language or input file does not apply
+            if header.get("language") != lang or header.get("source") != source:
+                return {}
+            for line in f:
+                try:
+                    # [key, text] pairs, so integer keys survive the round trip
+                    translations.update(_json_loads(line))
+                except ValueError:
+                    break  # Torn last line from an interrupted run
+    except (OSError, ValueError):
+        return {}
+    return translations
 
 def format_time(seconds):
     """Format time in human-readable format."""
@@ -54,103 +120,172 @@ def format_time(seconds):
 
 def format_timestamp(timestamp):
     """Format timestamp."""
-    return datetime.fromtimestamp(timestamp).strftime("%H:%M:%S")
+    # %H:%M:%S drops the fraction, so whole seconds are enough as a cache key
+    return _format_second(int(timestamp))
+
+@lru_cache(maxsize=4096)
+def _format_second(second):
+    return datetime.fromtimestamp(second).strftime("%H:%M:%S")
+
+BATCH_PENDING, BATCH_RUNNING, BATCH_COMPLETED, BATCH_FAILED = 0, 1, 2, 3
+
+# Marks a timestamp that has not been recorded yet
+_UNSET = float("nan")
 
 class BatchTelemetry:
     def __init__(self, total_batches):
         self.total_batches = total_batches
-        self.batches = []
-        for i in range(total_batches):
-            self.batches.append({
-                'started': None,
-                'finished': None,
-                'api_start': None,
-                'api_end': None,
-                'file_start': None,
-                'file_end': None,
-                'status': 'pending'
-            })
+        # One column of timestamps per event (NaN until set) instead of a
+        # dict per batch; status holds BATCH_* codes
+        self.started = array('d', [_UNSET]) * total_batches
+        self.finished = array('d', [_UNSET]) * total_batches
+        self.api_start = array('d', [_UNSET]) * total_batches
+        self.api_end = array('d', [_UNSET]) * total_batches
+        self.file_start = array('d', [_UNSET]) * total_batches
+        self.file_end = array('d', [_UNSET]) * total_batches
+        self.status = bytearray(total_batches)
+        self.last_started = -1
+        # Running totals for the final summary; end_api runs in worker threads
+        self.total_api_time = 0.0
+        self.total_file_time = 0.0
+        self.completed = 0
+        self.failed = 0
+        self._totals_lock = threading.Lock()
     
     def start_batch(self, batch_idx):
-        self.batches[batch_idx]['started'] = time.time()
-        self.batches[batch_idx]['status'] = 'running'
+        self.started[batch_idx] = time.time()
+        self.status[batch_idx] = BATCH_RUNNING
+        if batch_idx > self.last_started:
+            self.last_started = batch_idx
     
     def start_api(self, batch_idx):
-        self.batches[batch_idx]['api_start'] = time.time()
+        self.api_start[batch_idx] = time.time()
     
     def end_api(self, batch_idx):
-        self.batches[batch_idx]['api_end'] = time.time()
+        now = time.time()
+        self.api_end[batch_idx] = now
+        with self._totals_lock:
+            self.total_api_time += now - self.api_start[batch_idx]
     
     def start_file_ops(self, batch_idx):
-        self.batches[batch_idx]['file_start'] = time.time()
+        self.file_start[batch_idx] = time.time()
     
     def end_file_ops(self, batch_idx):
-        self.batches[batch_idx]['file_end'] = time.time()
+        now = time.time()
+        self.file_end[batch_idx] = now
+        self.total_file_time += now - self.file_start[batch_idx]
     
     def finish_batch(self, batch_idx):
-        self.batches[batch_idx]['finished'] = time.time()
-        self.batches[batch_idx]['status'] = 'completed'
+        self.finished[batch_idx] = time.time()
+        if self.status[batch_idx] != BATCH_COMPLETED:
+            self.status[batch_idx] = BATCH_COMPLETED
+            self.completed += 1
+    
+    def fail_batch(self, batch_idx):
+        self.finished[batch_idx] = time.time()
+        if self.status[batch_idx] != BATCH_FAILED:
+            self.status[batch_idx] = BATCH_FAILED
+            self.failed += 1
+    
+    @staticmethod
+    def _span(starts, ends, batch_idx):
+        span = ends[batch_idx] - starts[batch_idx]
+        return None if span != span else span  # NaN: not both set yet
     
     def get_batch_time(self, batch_idx):
-        batch = self.batches[batch_idx]
-        if batch['started'] and batch['finished']:
-            return batch['finished'] - batch['started']
-        return None
+        return self._span(self.started, self.finished, batch_idx)
     
     def get_api_time(self, batch_idx):
-        batch = self.batches[batch_idx]
-        if batch['api_start'] and batch['api_end']:
-            return batch['api_end'] - batch['api_start']
-        return None
+        return self._span(self.api_start, self.api_end, batch_idx)
     
     def get_file_time(self, batch_idx):
-        batch = self.batches[batch_idx]
-        if batch['file_start'] and batch['file_end']:
-            return batch['file_end'] - batch['file_start']
-        return None
+        return self._span(self.file_start, self.file_end, batch_idx)
     
-    def print_status(self):
+    def get_api_wall_time(self):
+        """Wall-clock time with at least one API call in flight (overlaps counted once)."""
+        spans = sorted((s, e) for s, e in zip(self.api_start, self.api_end) if e - s == e - s)
+        total = 0.0
+        cur_start = cur_end = None
+        for start, end in spans:
+            if cur_end is None or start > cur_end:
+                if cur_end is not None:
+                    total += cur_end - cur_start
+                cur_start, cur_end = start, end
+            elif end > cur_end:
+                cur_end = end
+        if cur_end is not None:
+            total += cur_end - cur_start
+        return total
+
+    def print_status(self, tail=10):
+        """Print the last tail batches up to the newest started one (all if tail is None)."""
         print("\n" + "="*80)
         print("📊 BATCH TELEMETRY")
         print("="*80)
         
-        for i, batch in enumerate(self.batches, 1):
-            if batch['status'] == 'completed':
-                start_time = format_timestamp(batch['started'])
-                end_time = format_timestamp(batch['finished'])
+        end = self.last_started + 1
+        first = 0 if tail is None else max(end - tail, 0)
+        if first:
+            failed = f", {self.failed} failed" if self.failed else ""
+            print(f"… {first} earlier batches ({self.completed}/{self.total_batches} completed overall{failed})")
+        
+        for i in range(first + 1, end + 1):
+            status = self.status[i-1]
+            if status == BATCH_COMPLETED:
+                start_time = format_timestamp(self.started[i-1])
+                end_time = format_timestamp(self.finished[i-1])
                 elapsed = format_time(self.get_batch_time(i-1))
                 api_time = format_time(self.get_api_time(i-1)) if self.get_api_time(i-1) else "N/A"
                 file_time = format_time(self.get_file_time(i-1)) if self.get_file_time(i-1) else "N/A"
                 
                 print(f"{i:2d}. batch - ✅ Started: {start_time} - Finished: {end_time} - Total: {elapsed} (API: {api_time}, File: {file_time})")
             
-            elif batch['status'] == 'running':
-                start_time = format_timestamp(batch['started'])
-                elapsed = format_time(time.time() - batch['started'])
+            elif status == BATCH_FAILED:
+                start_time = format_timestamp(self.started[i-1])
+                end_time = format_timestamp(self.finished[i-1])
+                print(f"{i:2d}. batch - ❌ Started: {start_time} - Failed: {end_time}")
+            
+            elif status == BATCH_RUNNING:
+                start_time = format_timestamp(self.started[i-1])
+                elapsed = format_time(time.time() - self.started[i-1])
                 print(f"{i:2d}. batch - 🔄 Started: {start_time} - Running... - Elapsed: {elapsed}")
             
             else:  # pending
                 print(f"{i:2d}. batch - ⏳ Waiting...")
+        
+        if end < self.total_batches:
+            print(f"⏳ {self.total_batches - end} more batches waiting...")
     
     def print_final_summary(self, total_start_time, total_items, translated_items):
         total_time = time.time() - total_start_time
-        total_api_time = sum(self.get_api_time(i) or 0 for i in range(len(self.batches)))
-        total_file_time = sum(self.get_file_time(i) or 0 for i in range(len(self.batches)))
-        processing_time = total_time - total_api_time - total_file_time
+        # Batches overlap, so API time is reported as wall-clock time with a
+        # request in flight; the per-batch sum can exceed the run time
+        api_wall_time = self.get_api_wall_time()
+        total_file_time = self.total_file_time
+        processing_time = max(total_time - api_wall_time - total_file_time, 0.0)
+        # Percent of wall time; a run that measured no time reports 0%
+        inv = 100.0 / total_time if total_time > 0 else 0.0
         
         print("\n" + "="*80)
         print("🎯 FINAL SUMMARY")
         print("="*80)
         print(f"📁 Total items processed: {translated_items}/{total_items}")
         print(f"⏱️  Total time elapsed: {format_time(total_time)}")
-        print(f"🌐 API request time: {format_time(total_api_time)} ({total_api_time/total_time*100:.1f}%)")
-        print(f"💾 File operations time: {format_time(total_file_time)} ({total_file_time/total_time*100:.1f}%)")
-        print(f"⚙️  Processing time: {format_time(processing_time)} ({processing_time/total_time*100:.1f}%)")
-        print(f"⚡ Translation speed: {translated_items/total_time:.1f} items/sec")
-        print(f"📊 Completed batches: {sum(1 for b in self.batches if b['status'] == 'completed')}/{len(self.batches)}")
+        print(f"🌐 API request time: {format_time(api_wall_time)} ({api_wall_time*inv:.1f}%, "
+              f"{format_time(self.total_api_time)} summed over batches)")
+        print(f"💾 File operations time: {format_time(total_file_time)} ({total_file_time*inv:.1f}%)")
+        print(f"⚙️  Processing time: {format_time(processing_time)} ({processing_time*inv:.1f}%)")
+        speed = translated_items / total_time if total_time > 0 else 0.0
+        print(f"⚡ Translation speed: {speed:.1f} items/sec")
+        print(f"📊 Completed batches: {self.completed}/{self.total_batches}")
+        if self.failed:
+            print(f"❌ Failed batches: {self.failed}/{self.total_batches}")
 
-def translate_yaml_file(file_path, lang, api_key, batch_size=50):
-    """Enhanced translation with comprehensive telemetry and progress tracking."""
+def translate_yaml_file(file_path, lang, api_key, batch_size=50, max_workers=8):
+    """Enhanced translation with comprehensive telemetry and progress tracking.
+    
+    Up to max_workers batches are sent to the API at once.
+    """
     total_start = time.time()
     print(f"🔄 Loading file: {file_path}")
     
@@ -159,29 +294,23 @@ def translate_yaml_file(file_path, lang, api_key, batch_size=50):
     
     try:
         with open(file_path, "r", encoding="utf-8") as f:
-            original = yaml.safe_load(f)
+            original = yaml.load(f, Loader=_Loader)
     except Exception as e:
         print(f"❌ Error loading YAML file: {e}")
         return None
 
     flat = flatten_yaml(original)
-    keys = list(flat.keys())
-    values = list(flat.values())
 
-    # Prepare output dictionary
-    output = {}
-    translatable_items = []
-    
-    # Process all elements
-    for key, val in zip(keys, values):
-        if isinstance(val, str) and val.lower() not in ("true", "false") and val.strip():
-            translatable_items.append((key, val))
-            print(f"🔍 Queued: {key} = '{val[:50]}{'...' if len(val) > 50 else ''}'")
-        else:
-            output[key] = val
+    # Output starts as a full-size copy of the source (so it keeps the
+    # source's key order); translations overwrite values in place
+    output = dict(flat)
+    translatable_items = [
+        (key, val) for key, val in flat.items()
+        if isinstance(val, str) and val.strip() and val.lower() not in ("true", "false")
+    ]
 
     total_translatable = len(translatable_items)
-    print(f"📊 Total translatable texts: {total_translatable}")
+    print(f"🔍 Queued {total_translatable} items for translation")
     
     if total_translatable == 0:
         print("✅ No translatable text found!")
@@ -189,79 +318,134 @@ def translate_yaml_file(file_path, lang, api_key, batch_size=50):
 
     # Generate output filename
     output_file = f"translated_{Path(file_path).name}"
-    translated_count = 0
+    
+    # Pick up where an interrupted run left off
+    ckpt_file = f"{output_file}.ckpt.jsonl"
+    resumed = load_checkpoint(ckpt_file, lang, os.path.abspath(file_path))
+    if resumed:
+        remaining = []
+        for key, val in translatable_items:
+            if key in resumed:
+                output[key] = resumed[key]
+            else:
+                remaining.append((key, val))
+        print(f"♻️  Resuming from checkpoint: {total_translatable - len(remaining)} items already translated")
+        translatable_items = remaining
+    translated_count = total_translatable - len(translatable_items)
+    
+    # Identical texts are sent once and the translation is reused for every key
+    keys_by_text = {}
+    for key, val in translatable_items:
+        keys_by_text.setdefault(val, []).append(key)
+    duplicates = len(translatable_items) - len(keys_by_text)
+    if duplicates:
+        print(f"♻️  {duplicates} duplicate texts will reuse an earlier translation")
     
     # Initialize telemetry
-    chunks = list(chunked(translatable_items, batch_size))
+    chunks = list(chunked(keys_by_text.items(), batch_size))
     total_batches = len(chunks)
     telemetry = BatchTelemetry(total_batches)
 
     print(f"\n🚀 Starting translation into {total_batches} batches...")
 
-    # Process batches
-    for batch_num, chunk in enumerate(chunks, 1):
-        batch_idx = batch_num - 1
+    def translate_one_batch(batch_idx, chunk):
+        """Send one batch to the API and return its parsed translations."""
         telemetry.start_batch(batch_idx)
+        print(f"\n📡 Batch {batch_idx + 1}/{total_batches} ({len(chunk)} items)")
         
-        batch_size_actual = len(chunk)
-        print(f"\n📡 Batch {batch_num}/{total_batches} ({batch_size_actual} items)")
+        # Number the texts so the reply can be matched back line by line
+        prompt = "\n".join([f"{i}. {text}" for i, (text, _) in enumerate(chunk, 1)])
         
-        try:
-            # Prepare texts
-            texts_to_translate = [item[1] for item in chunk]
-            prompt = "\n".join([f"{i+1}. {text}" for i, text in enumerate(texts_to_translate)])
-            
-            print(f"🤖 Sending to AI...")
-            telemetry.start_api(batch_idx)
-            
-            # Make API call
-            resp = client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": f"Translate these texts to {lang}. Keep ALL placeholders like {{value}}, {{player}}, &7, &a, %placeholders%, \\n, <#RRGGBB> EXACTLY as they are. Do not change newlines (\\n), hex colors (<#RRGGBB>), or any formatting codes. Return only the translated text in numbered format."},
-                    {"role": "user", "content": prompt}
-                ],
-                timeout=30
-            )
-            
-            telemetry.end_api(batch_idx)
-            response_text = resp.choices[0].message.content.strip()
-            
-            # Parse response
-            lines = response_text.splitlines()
-            translated_batch = []
-            for line in lines:
-                if ". " in line and line[0].isdigit():
-                    translated_batch.append(line.split(". ", 1)[1])
-                elif line.strip() and not line.startswith(("1.", "2.", "3.", "4.", "5.")):
-                    translated_batch.append(line.strip())
-            
-            # Apply translations
-            for i, (key, original) in enumerate(chunk):
-                if i < len(translated_batch):
-                    output[key] = translated_batch[i]
-                    translated_count += 1
-                else:
-                    print(f"⚠️  Missing translation for: {key}")
-                    output[key] = original
-            
-            # Save progress
-            telemetry.start_file_ops(batch_idx)
-            save_progress(output, output_file)
-            telemetry.end_file_ops(batch_idx)
-            telemetry.finish_batch(batch_idx)
-            
-            api_time = telemetry.get_api_time(batch_idx)
-            file_time = telemetry.get_file_time(batch_idx)
-            print(f"✅ Batch completed (API: {format_time(api_time)}, File: {format_time(file_time)})")
-            print(f"💾 Progress saved: {translated_count}/{total_translatable} items")
-            
-            # Show telemetry
-            telemetry.print_status()
+        print(f"🤖 Sending to AI...")
+        telemetry.start_api(batch_idx)
+        
+        # Make API call
+        resp = client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": f"Translate these texts to {lang}. Keep ALL placeholders like {{value}}, {{player}}, &7, &a, %placeholders%, \\n, <#RRGGBB> EXACTLY as they are. Do not change newlines (\\n), hex colors (<#RRGGBB>), or any formatting codes. Return only the translated text in numbered format."},
+                {"role": "user", "content": prompt}
+            ],
+            timeout=30
+        )
+        
+        telemetry.end_api(batch_idx)
+        response_text = resp.choices[0].message.content.strip()
+        
+        # Parse response; lines are matched by their number, so a skipped or
+        # reordered line cannot shift translations onto the wrong keys
+        numbered = dict(_NUMBERED_LINE_RE.findall(response_text))
+        translated_batch = [numbered.get(str(i)) for i in range(1, len(chunk) + 1)]
+        return batch_idx, translated_batch
+
+    # Batches finish in any order; output already holds every key in source
+    # order, so translations are written into it in place. Texts still
+    # pending keep their source value in progress saves
+    unsaved = 0
+    finished = 0
+
+    with open(ckpt_file, "ab" if resumed else "wb", buffering=0) as ckpt_fp, \
+            ThreadPoolExecutor(max_workers=max_workers) as executor:
+        if not resumed:
+            append_checkpoint(ckpt_fp, {"language": lang, "source": os.path.abspath(file_path)})
+        futures = {executor.submit(translate_one_batch, idx, chunk): idx for idx, chunk in enumerate(chunks)}
+        
+        for future in as_completed(futures):
+            batch_idx = futures[future]
+            batch_num = batch_idx + 1
+            chunk = chunks[batch_idx]
+            finished += 1
             
-        except Exception as e:
-            print(f"❌ Batch {batch_num} failed: {e}")
-            telemetry.finish_batch(batch_idx)
+            try:
+                _, translated_batch = future.result()
+                
+                # Apply translations
+                done = []
+                for (_, keys), text in zip(chunk, translated_batch):
+                    if text is None:
+                        print(f"⚠️  Missing translation for: {', '.join(map(str, keys))}")
+                        continue
+                    translated_count += len(keys)
+                    for key in keys:
+                        output[key] = text
+                        done.append([key, text])
+                
+                # Checkpoint every batch, rewrite the YAML every few batches.
+                # A batch with no usable translation leaves the output as it
+                # was (pending texts already hold their source value), so it
+                # neither dirties the YAML nor adds a checkpoint line
+                telemetry.start_file_ops(batch_idx)
+                if done:
+                    append_checkpoint(ckpt_fp, done)
+                    unsaved += 1
+                saved = unsaved >= SAVE_EVERY_BATCHES
+                if saved:
+                    save_progress(output, output_file)
+                    unsaved = 0
+                telemetry.end_file_ops(batch_idx)
+                telemetry.finish_batch(batch_idx)
+                
+                api_time = telemetry.get_api_time(batch_idx)
+                file_time = telemetry.get_file_time(batch_idx)
+                print(f"✅ Batch {batch_num} completed (API: {format_time(api_time)}, File: {format_time(file_time)})")
+                if saved:
+                    print(f"💾 Progress saved: {translated_count}/{total_translatable} items")
+                
+                # Show telemetry now and then rather than after every batch
+                if finished % STATUS_EVERY_BATCHES == 0 or finished == total_batches:
+                    telemetry.print_status()
+                
+            except Exception as e:
+                print(f"❌ Batch {batch_num} failed: {e}")
+                telemetry.fail_batch(batch_idx)
+    
+    # Always write the final file, even if no batch produced a translation
+    save_progress(output, output_file)
+    print(f"💾 Progress saved: {translated_count}/{total_translatable} items")
+    if translated_count == total_translatable:
+        Path(ckpt_file).unlink(missing_ok=True)
+    else:
+        print(f"💾 Checkpoint kept, run again to resume: {ckpt_file}")
     
     # Final summary
     telemetry.print_final_summary(total_start, total_translatable, translated_count)